@@ -1,8 +1,10 @@
 import sys
 import os
 
-# Add project root to Python path
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+# Add project root to Python path (once - Streamlit re-executes this script on every rerun)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from core.compose import compose, pipe
 from core.services import (
@@ -12,57 +14,57 @@ from core.services import (
     calculate_average_rating, calculate_user_average_rating, calculate_favorite_genre,
     select_user_books, select_user_ratings
 )
+import bisect
 import heapq
-from typing import Iterable, Iterator, Tuple, List, Callable, Any
+import itertools
+from collections import Counter, defaultdict, deque
+import operator
+import re
+from typing import Iterable, Iterator, Tuple, List, Callable, Any, Optional
+import numpy as np
+import pandas as pd
 import streamlit as st
-import sys
-import os
 import time
 from dataclasses import dataclass
-from typing import List, Optional
 import asyncio
 
 def lazy_top_k(stream: Iterable[Tuple[str, float]], k: int) -> Iterator[Tuple[str, float]]:
-    """Streaming top-K implementation"""
-    heap = []
+    """Streaming top-K implementation
+
+    The window is kept in ascending order with bisect, so the smallest item
+    sits at index 0 (like a min-heap) and no sort is needed per element.
+    A snapshot is only yielded when the top-K actually changes.
+    """
+    window = []
     for item_id, score in stream:
-        if len(heap) < k:
-            heapq.heappush(heap, (score, item_id))
+        if len(window) < k:
+            bisect.insort(window, (score, item_id))
+        elif window and score > window[0][0]:
+            del window[0]
+            bisect.insort(window, (score, item_id))
         else:
-            if score > heap[0][0]:
-                heapq.heappushpop(heap, (score, item_id))
-        current_top = sorted(heap, reverse=True)
-        yield [(item_id, score) for score, item_id in current_top]
+            continue
+        yield [(top_id, top_score) for top_score, top_id in reversed(window)]
 
 
 def lazy_book_search(books, search_terms, min_rating=0.0):
     """Lazy book search implementation"""
+    terms_lc = [term.lower() for term in search_terms or () if term and term.strip()]
+    if not terms_lc:
+        return
+    matcher = re.compile("|".join(map(re.escape, terms_lc)))
     for book in books:
         if book.rating < min_rating:
             continue
-        if not search_terms:
-            continue
-        matches = any(
-            term.lower() in book.title.lower() or
-            term.lower() in book.author.lower()
-            for term in search_terms if term and term.strip()
-        )
-        if matches:
+        if matcher.search(book.title.lower()) or matcher.search(book.author.lower()):
             yield book
 
 
 def batch_process_books(books, batch_size=5, process_func=None):
     """Batch processing implementation"""
-    batch = []
-    for book in books:
-        batch.append(book)
-        if len(batch) >= batch_size:
-            result = process_func(batch) if process_func else batch
-            yield result
-            batch = []
-    if batch:
-        result = process_func(batch) if process_func else batch
-        yield result
+    it = iter(books)
+    while batch := list(itertools.islice(it, batch_size)):
+        yield process_func(batch) if process_func else batch
 
 
 def test_lazy_top_k():
@@ -86,9 +88,9 @@ class Event:
 
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, max_history: int = 10_000):
         self._subscribers = {}
-        self._event_history = []
+        self._event_history = deque(maxlen=max_history)
 
     def subscribe(self, event_type: str, handler: Callable):
         if event_type not in self._subscribers:
@@ -106,42 +108,59 @@ class EventBus:
                 except Exception as e:
                     print(f"Error in event handler: {e}")
 
+    def publish_batch(self, events):
+        """Publish (event_type, payload) pairs in order, looking up subscribers once per type"""
+        handlers_by_type = {}
+        for event_type, payload in events:
+            event = Event(event_type, payload, time.time())
+            self._event_history.append(event)
+
+            handlers = handlers_by_type.get(event_type)
+            if handlers is None:
+                handlers = handlers_by_type[event_type] = self._subscribers.get(event_type, [])
+            for handler in handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Error in event handler: {e}")
+
     def get_event_history(self):
-        return self._event_history.copy()
+        return list(self._event_history)
 
     def clear_history(self):
         self._event_history.clear()
 
 
+def _new_user_activity():
+    return {'rating_count': 0, 'review_count': 0, 'loan_count': 0, 'last_activity': 0}
+
+
 class EventHandlers:
     def __init__(self, books, users, ratings):
         self.books = books
         self.users = users
         self.ratings = ratings
+        # id indices so event handlers avoid a linear scan per event
+        self.books_by_id = {b.id: b for b in books}
+        self.users_by_id = {u.id: u for u in users}
         self.state = {
-            'weekly_top_genres': {},
-            'user_activity': {},
+            'weekly_top_genres': Counter(),
+            'user_activity': defaultdict(_new_user_activity),
             'popular_books': {},
             'recent_loans': []
         }
+        self._top_genres = {}
 
     def update_weekly_top_genres(self, event: Event):
-        if event.name == "RATING_ADDED":
-            book_id = event.payload.get('book_id')
-            book = next((b for b in self.books if b.id == book_id), None)
+        if event.name != "RATING_ADDED":
+            return self._top_genres
 
-            if book:
-                genre = book.genre
-                self.state['weekly_top_genres'][genre] = \
-                    self.state['weekly_top_genres'].get(genre, 0) + 1
-
-        sorted_genres = sorted(
-            self.state['weekly_top_genres'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
-        return dict(sorted_genres[:5])
+        book = self.books_by_id.get(event.payload.get('book_id'))
+        if book:
+            self.state['weekly_top_genres'][book.genre] += 1
+            # Top 5 by count descending, recomputed only when a count changes
+            self._top_genres = dict(self.state['weekly_top_genres'].most_common(5))
+        return self._top_genres
 
     def update_popular_books(self, event: Event):
         if event.name in ["RATING_ADDED", "LOAN_ISSUED"]:
@@ -154,22 +173,17 @@ class EventHandlers:
                 elif event.name == "LOAN_ISSUED":
                     self.state['popular_books'][book_id] = current_score + 1
 
-        return dict(sorted(
+        return dict(heapq.nlargest(
+            10,
             self.state['popular_books'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10])
+            key=operator.itemgetter(1)
+        ))
 
     def update_user_activity(self, event: Event):
         user_id = event.payload.get('user_id')
 
         if user_id:
-            user_activity = self.state['user_activity'].get(user_id, {
-                'rating_count': 0,
-                'review_count': 0,
-                'loan_count': 0,
-                'last_activity': 0
-            })
+            user_activity = self.state['user_activity'][user_id]
 
             if event.name == "RATING_ADDED":
                 user_activity['rating_count'] += 1
@@ -179,7 +193,6 @@ class EventHandlers:
                 user_activity['loan_count'] += 1
 
             user_activity['last_activity'] = event.timestamp
-            self.state['user_activity'][user_id] = user_activity
 
         return self.state['user_activity']
 
@@ -195,12 +208,12 @@ class EventHandlers:
                 self.state['recent_loans'] = []
             self.state['recent_loans'].append(loan_data)
 
-        if 'recent_loans' in self.state:
-            self.state['recent_loans'] = sorted(
+            # Only a new loan can change the ordering
+            self.state['recent_loans'] = heapq.nlargest(
+                15,
                 self.state['recent_loans'],
-                key=lambda x: x['timestamp'],
-                reverse=True
-            )[:15]
+                key=operator.itemgetter('timestamp')
+            )
 
         return self.state.get('recent_loans', [])
 
@@ -211,9 +224,6 @@ event_bus = EventBus()
 # Page configuration - MUST BE FIRST STREAMLIT COMMAND
 st.set_page_config(page_title="Book Recommendation System", layout="wide")
 
-# Add project root to system path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Try to import core modules, use fallback definitions if failed
 try:
     from core.domain import Book, User, Rating
@@ -232,17 +242,19 @@ except ImportError as e:
 
     # Fallback definitions
     class Maybe:
+        __slots__ = ('value',)
+
         def __init__(self, value=None):
             self.value = value
 
         def map(self, func):
-            return Maybe(func(self.value) if self.value else None)
+            return Maybe(func(self.value)) if self.value is not None else NOTHING
 
         def bind(self, func):
-            return func(self.value) if self.value else Maybe()
+            return func(self.value) if self.value is not None else NOTHING
 
         def get_or_else(self, default):
-            return self.value if self.value else default
+            return self.value if self.value is not None else default
 
         def is_just(self):
             return self.value is not None
@@ -252,32 +264,41 @@ except ImportError as e:
 
 
     class Just(Maybe):
+        __slots__ = ()
+
         def __init__(self, value):
             super().__init__(value)
 
 
     class Nothing(Maybe):
+        __slots__ = ()
+
         def __init__(self):
             super().__init__(None)
 
 
+    NOTHING = Nothing()  # Shared instance, Nothing carries no state
+
+
     class Either:
+        __slots__ = ('value', 'error')
+
         def __init__(self, value=None, error=None):
             self.value = value
             self.error = error
 
         def map(self, func):
-            if self.value:
+            if self.value is not None:
                 return Either(value=func(self.value))
             return Either(error=self.error)
 
         def bind(self, func):
-            if self.value:
+            if self.value is not None:
                 return func(self.value)
             return Either(error=self.error)
 
         def get_or_else(self, default):
-            return self.value if self.value else default
+            return self.value if self.value is not None else default
 
         def is_right(self):
             return self.value is not None
@@ -287,11 +308,15 @@ except ImportError as e:
 
 
     class Right(Either):
+        __slots__ = ()
+
         def __init__(self, value):
             super().__init__(value=value)
 
 
     class Left(Either):
+        __slots__ = ()
+
         def __init__(self, error):
             super().__init__(error=error)
 
@@ -301,7 +326,7 @@ except ImportError as e:
         for book in books:
             if book.id == book_id:
                 return Just(book)
-        return Nothing()
+        return NOTHING
 
 
     def validate_rating(rating, books, users, existing_ratings):
@@ -344,6 +369,9 @@ except ImportError as e:
     def add_rating_pipeline(new_rating, ratings, books, users):
         validation_result = validate_rating(new_rating, books, users, ratings)
         if validation_result.is_right():
+            if isinstance(ratings, list):  # Growable buffer: append in place
+                ratings.append(validation_result.value)
+                return Right(ratings)
             return Right(ratings + (validation_result.value,))
         return validation_result
 
@@ -351,7 +379,7 @@ except ImportError as e:
     def calculate_avg_rating_safe(ratings, book_id):
         book_ratings = [r.value for r in ratings if r.book_id == book_id]
         if not book_ratings:
-            return Nothing()
+            return NOTHING
         avg_rating = sum(book_ratings) / len(book_ratings)
         return Just(avg_rating)
 
@@ -409,6 +437,14 @@ except ImportError as e:
         pass
 
 
+    def avg_ratings_by_book(ratings):
+        totals, counts = defaultdict(int), defaultdict(int)
+        for r in ratings:
+            totals[r.book_id] += r.value
+            counts[r.book_id] += 1
+        return {book_id: totals[book_id] / counts[book_id] for book_id in totals}
+
+
 @dataclass
 class Tag:
     id: str
@@ -417,8 +453,13 @@ class Tag:
     children: List['Tag'] = None
 
 
+@st.cache_resource
 def create_extended_kazakh_books_data():
-    """Create extended data with 100 Kazakh books"""
+    """Create extended data with 100 Kazakh books
+
+    Cached across reruns; the returned tuples of frozen dataclasses are
+    immutable, so every session can share the same objects.
+    """
 
     sample_books = (
         # Classic Literature (20 books)
@@ -635,23 +676,78 @@ def create_sample_data():
     return create_extended_kazakh_books_data()
 
 
+class BookTable:
+    """Column-oriented (structure-of-arrays) view of the book catalogue.
+
+    The fields that filters, search and aggregates read (year, rating, genre,
+    casefolded title/author) live in their own NumPy arrays, so those run as
+    vectorized array operations instead of Python-level attribute access.
+    The original Book objects are kept in `rows` for everything else.
+    """
+
+    def __init__(self, books):
+        self.rows = tuple(books)
+        self.years = np.array([b.year for b in self.rows], dtype=np.int16)
+        # Ratings quantized to tenths (4.7 -> 47); compare via rating_units()
+        self.ratings_q = np.array([self.rating_units(b.rating) for b in self.rows], dtype=np.uint8)
+        # Genres as categorical codes: genre_names[genre_codes[i]] == rows[i].genre
+        self.genre_names, self.genre_codes = np.unique(np.array([b.genre for b in self.rows], dtype=str), return_inverse=True)
+        # Casefolded copies for case-insensitive search, built once per load
+        self.titles_lc = np.array([b.title.casefold() for b in self.rows], dtype=str)
+        self.authors_lc = np.array([b.author.casefold() for b in self.rows], dtype=str)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def rating_units(rating: float) -> int:
+        """Rating in the quantized units of `ratings_q`"""
+        return int(round(rating * 10))
+
+    def take(self, mask):
+        """Gather the Book rows selected by a boolean mask"""
+        return [self.rows[i] for i in np.flatnonzero(mask)]
+
+    def genre_mask(self, genre: str):
+        """Boolean mask of books whose genre equals `genre` (exact match)"""
+        code = np.searchsorted(self.genre_names, genre)
+        if code == len(self.genre_names) or self.genre_names[code] != genre:
+            return np.zeros(len(self), dtype=bool)
+        return self.genre_codes == code
+
+    def average_rating(self):
+        return float(self.ratings_q.mean()) / 10 if len(self) else 0.0
+
+    def search(self, term: str):
+        """Case-insensitive substring match on title or author"""
+        if not len(self):
+            return []
+        needle = term.casefold()
+        mask = (np.char.find(self.titles_lc, needle) >= 0) | (np.char.find(self.authors_lc, needle) >= 0)
+        return self.take(mask)
+
+
 # Recursive function definitions
-def find_tag_by_name_simple(tags, name: str):
-    """Simplified tag search"""
-    for tag in tags:
-        if tag.name.lower() == name.lower():
-            return tag
-        if tag.children:  # Directly check children
-            result = find_tag_by_name_simple(tag.children, name)
-            if result:
-                return result
-    return None
+def build_tag_index(tags):
+    """Map casefolded tag names to tags (depth-first, first match wins)"""
+    index = {}
+    stack = list(reversed(tags))
+    while stack:
+        tag = stack.pop()
+        index.setdefault(tag.name.casefold(), tag)
+        if tag.children:  # Visit children before later siblings
+            stack.extend(reversed(tag.children))
+    return index
 
 
 def build_genre_hierarchy_simple(books):
     """Simplified genre hierarchy building"""
-    genres = set(book.genre for book in books)
+    # The hierarchy only depends on the distinct genres, so cache on those
+    return _build_genre_tags(tuple(dict.fromkeys(book.genre for book in books)))
+
 
+@st.cache_resource
+def _build_genre_tags(genres):
     fiction_tags = []
     nonfiction_tags = []
 
@@ -668,12 +764,16 @@ def build_genre_hierarchy_simple(books):
 
 
 def display_hierarchy_simple(tags, level=0):
-    """Simplified hierarchy display"""
-    for tag in tags:
-        indent = "&nbsp;" * (level * 4)
-        st.markdown(f"{indent}📁 **{tag.name}**")
+    """Simplified hierarchy display, rendered as a single markdown block"""
+    lines = []
+    stack = [(tag, level) for tag in reversed(tags)]
+    while stack:
+        tag, depth = stack.pop()
+        indent = "&nbsp;" * (depth * 4)
+        lines.append(f"{indent}📁 **{tag.name}**")
         if tag.children:
-            display_hierarchy_simple(tag.children, level + 1)
+            stack.extend((child, depth + 1) for child in reversed(tag.children))
+    st.markdown("  \n".join(lines))
 
 
 # Simplified filter functions (if not found in core.filters)
@@ -696,26 +796,21 @@ def create_rating_filter(min_rating: float = 0.0, max_rating: float = 5.0):
 
 
 def create_advanced_search(genres=None, min_rating=0, start_year=1900, end_year=2025):
-    """Create advanced search"""
-
-    def search_function(books):
-        filters = []
+    """Create advanced search over a BookTable
 
-        if genres:
-            genre_filter = lambda book: any(genre.lower() == book.genre.lower() for genre in genres)
-            filters.append(genre_filter)
+    The returned closure combines all criteria into one vectorized boolean
+    mask instead of calling a chain of per-book predicates.
+    """
+    genres_lc = frozenset(genre.lower() for genre in genres or ())
 
+    def search_function(table):
+        mask = (table.years >= start_year) & (table.years <= end_year)
         if min_rating > 0:
-            rating_filter = create_rating_filter(min_rating)
-            filters.append(rating_filter)
-
-        year_filter = lambda book: start_year <= book.year <= end_year
-        filters.append(year_filter)
-
-        def combined_filter(book):
-            return all(f(book) for f in filters)
-
-        return tuple(filter(combined_filter, books))
+            mask &= (table.ratings_q >= table.rating_units(min_rating)) & (table.ratings_q <= table.rating_units(5.0))
+        if genres_lc:
+            codes = [code for code, name in enumerate(table.genre_names) if name.lower() in genres_lc]
+            mask &= np.isin(table.genre_codes, codes)
+        return tuple(table.take(mask))
 
     return search_function
 
@@ -726,8 +821,83 @@ menu = st.sidebar.radio("Select Page",
                         ["Overview", "Data", "Functional Core", "Lambdas & Closures", "Recursion",
                          "Recommendations (Cached)", "Functional Patterns", "Lazy Computations", "Async/FRP","Functional Core · Pipelines · Reports","Parallel Recommendations"])
 
+def group_books_by_genre(books):
+    """Inverted index genre -> books, so related-book lookups skip a full scan"""
+    by_genre = defaultdict(list)
+    for book in books:
+        by_genre[book.genre].append(book)
+    return {genre: tuple(group) for genre, group in by_genre.items()}
+
+
+@dataclass(frozen=True)
+class AppState:
+    """Loaded dataset plus the lookup structures derived from it"""
+    books: tuple
+    users: tuple
+    ratings: tuple
+    book_table: BookTable
+    books_by_id: dict
+    users_by_id: dict
+    avg_rating_by_book: dict
+    book_by_label: dict  # "Title by Author" -> Book, in catalogue order
+    user_options: dict  # "id: name" -> user id, in load order
+    book_options: dict  # "id: title" -> book id, in catalogue order
+    books_by_genre: dict  # genre -> tuple of its books, in catalogue order
+    books_by_rating: tuple  # highest rated first, ties in catalogue order
+    neg_ratings: tuple  # -rating for books_by_rating, ascending for bisect
+    stats: dict  # dataset counts and average book rating, shown on several pages
+    books_df: pd.DataFrame  # Data page table, one row per book
+
+
+@st.cache_resource
+def get_app_state() -> AppState:
+    """Load the dataset and build its indices once per server process"""
+    # Tuples: hashable, and the same objects are handed to every lru_cache call
+    books, users, ratings = map(tuple, create_sample_data())
+    books_by_rating = tuple(sorted(books, key=lambda b: b.rating, reverse=True))
+    book_table = BookTable(books)
+    return AppState(
+        books=books,
+        users=users,
+        ratings=ratings,
+        book_table=book_table,
+        books_by_id={b.id: b for b in books},
+        users_by_id={u.id: u for u in users},
+        avg_rating_by_book=avg_ratings_by_book(ratings),
+        book_by_label={f"{b.title} by {b.author}": b for b in books},
+        user_options={f"{u.id}: {u.name}": u.id for u in users},
+        book_options={f"{b.id}: {b.title}": b.id for b in books},
+        books_by_genre=group_books_by_genre(books),
+        books_by_rating=books_by_rating,
+        neg_ratings=tuple(-b.rating for b in books_by_rating),
+        stats={
+            "books": len(books),
+            "users": len(users),
+            "ratings": len(ratings),
+            "avg_rating": book_table.average_rating(),
+        },
+        books_df=pd.DataFrame({
+            "ID": [b.id for b in books],
+            "Title": [b.title for b in books],
+            "Author": [b.author for b in books],
+            "Genre": [b.genre for b in books],
+            "Year": [b.year for b in books],
+            "Rating": [b.rating for b in books],
+        }),
+    )
+
+
 # Load data
-books_data, users_data, ratings_data = create_sample_data()
+app_state = get_app_state()
+books_data, users_data, ratings_data = app_state.books, app_state.users, app_state.ratings
+book_table = app_state.book_table
+
+
+def cached_avg_rating(book_id):
+    """Maybe-wrapped average for the loaded ratings, read from the precomputed table"""
+    avg = app_state.avg_rating_by_book.get(book_id)
+    return Just(avg) if avg is not None else Nothing()
+
 
 # Overview Page
 if menu == "Overview":
@@ -737,78 +907,80 @@ if menu == "Overview":
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Books", len(books_data))
+        st.metric("Total Books", app_state.stats["books"])
     with col2:
-        st.metric("Total Users", len(users_data))
+        st.metric("Total Users", app_state.stats["users"])
     with col3:
-        st.metric("Total Ratings", len(ratings_data))
+        st.metric("Total Ratings", app_state.stats["ratings"])
     with col4:
-        # Simplified average rating calculation
-        if books_data:
-            avg_rating = sum(book.rating for book in books_data) / len(books_data)
+        st.metric("Average Rating", f"{app_state.stats['avg_rating']:.2f}")
+
+
+    # Search and catalog rerun on their own, without redrawing the metrics above
+    @st.fragment
+    def book_search_and_catalog():
+        # Search functionality
+        st.subheader("Book Search")
+        search_term = st.text_input("Enter book title or author:")
+
+        if search_term:
+            filtered_books = book_table.search(search_term)
+            st.write(f"Found: {len(filtered_books)} books")
         else:
-            avg_rating = 0
-        st.metric("Average Rating", f"{avg_rating:.2f}")
-
-    # Search functionality
-    st.subheader("Book Search")
-    search_term = st.text_input("Enter book title or author:")
-
-    if search_term:
-        filtered_books = [book for book in books_data
-                          if search_term.lower() in book.title.lower()
-                          or search_term.lower() in book.author.lower()]
-        st.write(f"Found: {len(filtered_books)} books")
-    else:
-        filtered_books = books_data
+            filtered_books = books_data
 
-    # Pagination display
-    st.subheader("Book Catalog")
-    items_per_page = 10
-    total_pages = (len(filtered_books) + items_per_page - 1) // items_per_page
+        # Pagination display
+        st.subheader("Book Catalog")
+        items_per_page = 10
+        total_pages = (len(filtered_books) + items_per_page - 1) // items_per_page
 
-    if total_pages > 1:
-        page = st.number_input("Page:", min_value=1, max_value=total_pages, value=1)
-        start_idx = (page - 1) * items_per_page
-        end_idx = min(start_idx + items_per_page, len(filtered_books))
+        if total_pages > 1:
+            page = st.number_input("Page:", min_value=1, max_value=total_pages, value=1)
+            start_idx = (page - 1) * items_per_page
+            end_idx = min(start_idx + items_per_page, len(filtered_books))
 
-        st.write(f"Showing: {start_idx + 1}-{end_idx} (of {len(filtered_books)} books)")
+            st.write(f"Showing: {start_idx + 1}-{end_idx} (of {len(filtered_books)} books)")
 
-        for book in filtered_books[start_idx:end_idx]:
-            st.write(f"- **{book.title}** by {book.author} ({book.year}) - ⭐ {book.rating}")
-    else:
-        for book in filtered_books:
-            st.write(f"- **{book.title}** by {book.author} ({book.year}) - ⭐ {book.rating}")
+            st.markdown("\n".join(
+                f"- **{book.title}** by {book.author} ({book.year}) - ⭐ {book.rating}"
+                for book in filtered_books[start_idx:end_idx]
+            ))
+        else:
+            st.markdown("\n".join(
+                f"- **{book.title}** by {book.author} ({book.year}) - ⭐ {book.rating}"
+                for book in filtered_books
+            ))
+
+
+    book_search_and_catalog()
 
 # Data Page
 elif menu == "Data":
     st.title("🌐 Data Management")
 
-    st.write(f"**Statistics:** {len(books_data)} books, {len(users_data)} users, {len(ratings_data)} ratings")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Books", app_state.stats["books"])
+    col2.metric("Users", app_state.stats["users"])
+    col3.metric("Ratings", app_state.stats["ratings"])
 
-    # Paginated book data display
-    st.subheader("Books Data")
 
-    items_per_page = 15
-    total_pages = (len(books_data) + items_per_page - 1) // items_per_page
+    # Paginated book data display - page changes rerun only this fragment
+    @st.fragment
+    def books_data_pages():
+        st.subheader("Books Data")
 
-    page = st.number_input("Page:", min_value=1, max_value=total_pages, value=1, key="data_page")
-    start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, len(books_data))
+        items_per_page = 15
+        total_pages = (len(books_data) + items_per_page - 1) // items_per_page
+
+        page = st.number_input("Page:", min_value=1, max_value=total_pages, value=1, key="data_page")
+        start_idx = (page - 1) * items_per_page
+        end_idx = min(start_idx + items_per_page, len(books_data))
+
+        st.dataframe(app_state.books_df.iloc[start_idx:end_idx], width="stretch", hide_index=True)
+        st.write(f"Showing: {start_idx + 1}-{end_idx} (of {len(books_data)} books)")
 
-    book_data_table = []
-    for book in books_data[start_idx:end_idx]:
-        book_data_table.append({
-            "ID": book.id,
-            "Title": book.title,
-            "Author": book.author,
-            "Genre": book.genre,
-            "Year": book.year,
-            "Rating": book.rating
-        })
 
-    st.table(book_data_table)
-    st.write(f"Showing: {start_idx + 1}-{end_idx} (of {len(books_data)} books)")
+    books_data_pages()
 
 # Functional Core Page
 elif menu == "Functional Core":
@@ -816,19 +988,29 @@ elif menu == "Functional Core":
 
     st.subheader("Higher-Order Functions Demonstration")
 
+
+    @st.cache_resource
+    def higher_order_results():
+        # Filter, map and reduce results gathered in a single pass over the catalogue
+        recent_titles, book_info, rating_total = [], [], 0.0
+        for book in books_data:
+            if book.year >= 2000:
+                recent_titles.append(book.title)
+            book_info.append((book.title, book.year))
+            rating_total += book.rating
+        avg_rating = rating_total / len(books_data) if books_data else 0
+        return recent_titles, book_info[:10], avg_rating
+
+
+    recent_titles, book_info, avg_rating = higher_order_results()
+
     st.write("**1. Filter Function: Books published after 2000**")
-    recent_books = tuple(filter(lambda b: b.year >= 2000, books_data))
-    st.write("Results:", [b.title for b in recent_books])
+    st.write("Results:", recent_titles)
 
     st.write("**2. Map Function: Extract book titles and years**")
-    book_info = list(map(lambda b: (b.title, b.year), books_data))
-    st.write("Results:", book_info[:10])  # Show only first 10
+    st.write("Results:", book_info)  # Show only first 10
 
     st.write("**3. Reduce Function: Calculate average book rating**")
-    if books_data:
-        avg_rating = sum(book.rating for book in books_data) / len(books_data)
-    else:
-        avg_rating = 0
     st.write(f"Result: {avg_rating:.2f}")
 
     st.subheader("Interactive Filtering")
@@ -839,18 +1021,24 @@ elif menu == "Functional Core":
         st.write("**Filter by Genre**")
         selected_genre = st.selectbox("Select a genre:",
                                       ["Classic", "History", "Poetry", "Fiction", "Children", "Education"])
-        genre_books = tuple(filter(lambda b: b.genre == selected_genre, books_data))
+        genre_books = book_table.take(book_table.genre_mask(selected_genre))
         st.write(f"**{selected_genre} Books ({len(genre_books)} found):**")
-        for book in genre_books[:5]:  # Show only first 5
-            st.write(f"- {book.title} ({book.year}) - ⭐ {book.rating}")
+        # Show only first 5
+        st.markdown("\n".join(
+            f"- {book.title} ({book.year}) - ⭐ {book.rating}"
+            for book in genre_books[:5]
+        ))
 
     with col2:
         st.write("**Filter by Year**")
         min_year = st.slider("Minimum publication year:", 1900, 2025, 2000)
-        filtered_books = tuple(filter(lambda b: b.year >= min_year, books_data))
+        filtered_books = book_table.take(book_table.years >= min_year)
         st.write(f"**Books published after {min_year} ({len(filtered_books)} found):**")
-        for book in filtered_books[:5]:  # Show only first 5
-            st.write(f"- {book.title} - ⭐ {book.rating}")
+        # Show only first 5
+        st.markdown("\n".join(
+            f"- {book.title} - ⭐ {book.rating}"
+            for book in filtered_books[:5]
+        ))
 
 # Lambdas & Closures Page
 elif menu == "Lambdas & Closures":
@@ -865,19 +1053,28 @@ elif menu == "Lambdas & Closures":
         selected_genre = st.selectbox("Choose genre for closure:",
                                       ["Classic", "History", "Poetry"])
         genre_filter = create_genre_filter(selected_genre)
-        filtered_books = tuple(filter(genre_filter, books_data))
+        # The genre index already holds exactly these books; the closure only
+        # runs over the five that are shown, instead of the whole catalogue
+        filtered_books = app_state.books_by_genre.get(selected_genre, ())
         st.write(f"Books in {selected_genre}: {len(filtered_books)}")
-        for book in filtered_books[:5]:
-            st.write(f"- {book.title}")
+        st.markdown("\n".join(
+            f"- {book.title}"
+            for book in filter(genre_filter, filtered_books[:5])
+        ))
 
     with col2:
         st.write("**Rating Filter Closure**")
         min_rating = st.slider("Minimum rating:", 3.0, 5.0, 4.0, 0.1)
         rating_filter = create_rating_filter(min_rating)
-        high_rated_books = tuple(filter(rating_filter, books_data))
+        # Books are kept sorted by rating (highest first), so one bisect finds the
+        # cut-off; the closure then runs over the five that are shown
+        cutoff = bisect.bisect_right(app_state.neg_ratings, -min_rating)
+        high_rated_books = app_state.books_by_rating[:cutoff]
         st.write(f"High-rated books (≥{min_rating}): {len(high_rated_books)}")
-        for book in high_rated_books[:5]:
-            st.write(f"- {book.title} ⭐{book.rating}")
+        st.markdown("\n".join(
+            f"- {book.title} ⭐{book.rating}"
+            for book in filter(rating_filter, high_rated_books[:5])
+        ))
 
     st.subheader("Advanced Search with Combined Closures")
 
@@ -899,10 +1096,13 @@ elif menu == "Lambdas & Closures":
             start_year=start_year,
             end_year=end_year
         )
-        results = search_func(books_data)
+        results = search_func(book_table)
         st.write(f"**Advanced Search Results: {len(results)} books found**")
-        for book in results[:10]:  # Show only first 10 results
-            st.write(f"- {book.title} by {book.author} ({book.year}) - ⭐{book.rating}")
+        # Show only first 10 results
+        st.markdown("\n".join(
+            f"- {book.title} by {book.author} ({book.year}) - ⭐{book.rating}"
+            for book in results[:10]
+        ))
 
 # Recursion Page
 elif menu == "Recursion":
@@ -921,37 +1121,44 @@ elif menu == "Recursion":
     with col2:
         st.write("**Find Related Books (Recursive)**")
         selected_book = st.selectbox("Select a book to find related ones:",
-                                     [f"{b.title} by {b.author}" for b in books_data])
+                                     list(app_state.book_by_label))
 
         if selected_book:
-            book_index = [f"{b.title} by {b.author}" for b in books_data].index(selected_book)
-            selected_book_obj = books_data[book_index]
+            selected_book_obj = app_state.book_by_label[selected_book]
 
             if st.button("Find Related Books"):
-                related_books = []
-                for book in books_data:
-                    if book.id != selected_book_obj.id and book.genre == selected_book_obj.genre:
-                        related_books.append(book)
+                same_genre = app_state.books_by_genre[selected_book_obj.genre]
+                # Show only first 5 related books - stop scanning the bucket once they are found
+                related_books = itertools.islice(
+                    (book for book in same_genre if book.id != selected_book_obj.id), 5
+                )
 
-                st.write(f"**Found {len(related_books)} related books:**")
-                for book in related_books[:5]:  # Show only first 5 related books
-                    st.write(f"- {book.title} by {book.author} ({book.genre}) ⭐{book.rating}")
+                st.write(f"**Found {len(same_genre) - 1} related books:**")  # Bucket minus the selected book
+                st.markdown("\n".join(
+                    f"- {book.title} by {book.author} ({book.genre}) ⭐{book.rating}"
+                    for book in related_books
+                ))
 
     st.subheader("Tag Search Recursion")
 
-    # Create sample tag structure
-    root_tag = Tag("1", "Literature", None, [])
-    fiction_tag = Tag("2", "Fiction", None, [])
-    classic_tag = Tag("3", "Classic", None, [])
-    poetry_tag = Tag("4", "Poetry", None, [])
 
-    fiction_tag.children.extend([classic_tag, poetry_tag])
-    root_tag.children.append(fiction_tag)
+    @st.cache_resource
+    def sample_tag_index():
+        # Create sample tag structure and index it once
+        root_tag = Tag("1", "Literature", None, [])
+        fiction_tag = Tag("2", "Fiction", None, [])
+        classic_tag = Tag("3", "Classic", None, [])
+        poetry_tag = Tag("4", "Poetry", None, [])
+
+        fiction_tag.children.extend([classic_tag, poetry_tag])
+        root_tag.children.append(fiction_tag)
+        return build_tag_index([root_tag])
+
 
     search_tag = st.text_input("Search for tag in hierarchy:", "Classic")
 
     if st.button("Search Tag"):
-        found_tag = find_tag_by_name_simple([root_tag], search_tag)
+        found_tag = sample_tag_index().get(search_tag.casefold())
         if found_tag:
             st.success(f"✅ Found tag: {found_tag.name}")
             st.write(f"Tag ID: {found_tag.id}")
@@ -965,7 +1172,7 @@ elif menu == "Recommendations (Cached)":
     st.subheader("📊 Generate Book Recommendations")
 
     # User selection
-    user_options = {f"{user.id}: {user.name}": user.id for user in users_data}
+    user_options = app_state.user_options
     selected_user = st.selectbox("👤 Select User:", list(user_options.keys()))
     user_id = user_options[selected_user]
 
@@ -974,31 +1181,31 @@ elif menu == "Recommendations (Cached)":
 
     with col1:
         if st.button("🎯 Generate Recommendations (Uncached)", use_container_width=True):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             recommendations = recommend_for_user_uncached(
                 user_id,
-                tuple(ratings_data),
-                tuple(books_data)
+                ratings_data,
+                books_data
             )
-            end_time = time.time()
+            elapsed_us = (time.perf_counter_ns() - start_ns) // 1000
 
             st.session_state['uncached_recommendations'] = recommendations
-            st.session_state['uncached_time'] = (end_time - start_time) * 1000
+            st.session_state['uncached_time'] = elapsed_us / 1000.0  # ms
             st.session_state['current_user'] = selected_user
             st.success("Uncached recommendations generated!")
 
     with col2:
         if st.button("⚡ Generate Recommendations (Cached)", use_container_width=True):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             recommendations = recommend_for_user_cached(
                 user_id,
-                tuple(ratings_data),
-                tuple(books_data)
+                ratings_data,
+                books_data
             )
-            end_time = time.time()
+            elapsed_us = (time.perf_counter_ns() - start_ns) // 1000
 
             st.session_state['cached_recommendations'] = recommendations
-            st.session_state['cached_time'] = (end_time - start_time) * 1000
+            st.session_state['cached_time'] = elapsed_us / 1000.0  # ms
             st.session_state['current_user'] = selected_user
             st.success("Cached recommendations generated!")
 
@@ -1025,57 +1232,56 @@ elif menu == "Recommendations (Cached)":
         recommendations = st.session_state['cached_recommendations']
 
         if recommendations:
+            books_by_id = app_state.books_by_id
+            cards = []
             for i, (book_id, title, author, genre, score) in enumerate(recommendations, 1):
                 # Find book details
-                book = next((b for b in books_data if b.id == book_id), None)
+                book = books_by_id.get(book_id)
                 if book:
                     avg_rating = book.rating  # Use book's preset rating
 
-                    st.markdown(f"""
-                    **{i}. {title}**
-                    - 👨‍💼 **Author**: {author}
-                    - 📚 **Genre**: {genre}
-                    - ⭐ **Average Rating**: {avg_rating:.1f}
-                    - 🔥 **Recommendation Score**: {score:.3f}
-                    ---
-                    """)
+                    cards.append(
+                        f"**{i}. {title}**\n"
+                        f"- 👨‍💼 **Author**: {author}\n"
+                        f"- 📚 **Genre**: {genre}\n"
+                        f"- ⭐ **Average Rating**: {avg_rating:.1f}\n"
+                        f"- 🔥 **Recommendation Score**: {score:.3f}\n"
+                        f"\n---"
+                    )
+            # All cards in a single markdown element
+            st.markdown("\n\n".join(cards))
         else:
             st.info("No recommendations available for this user.")
 
     # Cache information display
     st.subheader("💾 Cache Information")
 
-    cache_info = get_cache_info()
-    col1, col2, col3, col4 = st.columns(4)
 
-    with col1:
-        st.metric("Cache Hits", cache_info.hits)
-    with col2:
-        st.metric("Cache Misses", cache_info.misses)
-    with col3:
-        st.metric("Current Size", cache_info.currsize)
-    with col4:
-        st.metric("Max Size", cache_info.maxsize)
+    # Refreshes itself every 2 seconds without rerunning the rest of the page
+    @st.fragment(run_every=2.0)
+    def cache_info_panel():
+        cache_info = get_cache_info()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Cache Hits", cache_info.hits)
+        col2.metric("Cache Misses", cache_info.misses)
+        col3.metric("Current Size", cache_info.currsize)
+        col4.metric("Max Size", cache_info.maxsize)
 
-    # Cache management
-    st.subheader("🔧 Cache Management")
 
-    col1, col2 = st.columns(2)
+    cache_info_panel()
 
-    with col1:
-        if st.button("🔄 Clear Cache", use_container_width=True):
-            clear_cache()
-            st.success("✅ Cache cleared successfully!")
-            # Clear session state recommendations
-            if 'cached_recommendations' in st.session_state:
-                del st.session_state['cached_recommendations']
-            if 'uncached_recommendations' in st.session_state:
-                del st.session_state['uncached_recommendations']
-            st.rerun()
+    # Cache management
+    st.subheader("🔧 Cache Management")
 
-    with col2:
-        if st.button("🔄 Refresh Cache Info", use_container_width=True):
-            st.rerun()
+    if st.button("🔄 Clear Cache", use_container_width=True):
+        clear_cache()
+        st.success("✅ Cache cleared successfully!")
+        # Clear session state recommendations
+        if 'cached_recommendations' in st.session_state:
+            del st.session_state['cached_recommendations']
+        if 'uncached_recommendations' in st.session_state:
+            del st.session_state['uncached_recommendations']
+        st.rerun()
 
     # Algorithm explanation
     with st.expander("🔍 Algorithm Details"):
@@ -1130,7 +1336,7 @@ elif menu == "Functional Patterns":
         rating_book_id = st.text_input("Enter book ID to calculate rating:", "1", key="maybe_rating_book")
 
         if st.button("Calculate Rating (Maybe)", key="maybe_calc_button"):
-            avg_maybe = calculate_avg_rating_safe(ratings_data, rating_book_id)
+            avg_maybe = cached_avg_rating(rating_book_id)
 
             if hasattr(avg_maybe, 'map'):
                 result = avg_maybe.map(
@@ -1150,18 +1356,18 @@ elif menu == "Functional Patterns":
 
         with st.form("rating_form"):
             user_id = st.selectbox("User:",
-                                   [f"{u.id}: {u.name}" for u in users_data],
+                                   list(app_state.user_options),
                                    key="either_rating_user")
             book_for_rating = st.selectbox("Book:",
-                                           [f"{b.id}: {b.title}" for b in books_data],
+                                           list(app_state.book_options),
                                            key="either_rating_book")
             rating_value = st.slider("Rating (1–5):", 1, 5, 5, key="either_rating_value")
 
             submitted = st.form_submit_button("Validate Rating (Either)")
 
             if submitted:
-                user_id_val = user_id.split(":")[0].strip()
-                book_id_val = book_for_rating.split(":")[0].strip()
+                user_id_val = app_state.user_options[user_id]
+                book_id_val = app_state.book_options[book_for_rating]
 
                 new_rating = Rating(user_id_val, book_id_val, rating_value)
 
@@ -1184,18 +1390,18 @@ elif menu == "Functional Patterns":
 
         with st.form("review_form"):
             user_id_review = st.selectbox("User (review):",
-                                          [f"{u.id}: {u.name}" for u in users_data],
+                                          list(app_state.user_options),
                                           key="either_review_user")
             book_for_review = st.selectbox("Book (review):",
-                                           [f"{b.id}: {b.title}" for b in books_data],
+                                           list(app_state.book_options),
                                            key="either_review_book")
             review_text = st.text_area("Review text:", "Excellent book! Really enjoyed it.", key="either_review_text")
 
             submitted_review = st.form_submit_button("Validate Review (Either)")
 
             if submitted_review:
-                user_id_val = user_id_review.split(":")[0].strip()
-                book_id_val = book_for_review.split(":")[0].strip()
+                user_id_val = app_state.user_options[user_id_review]
+                book_id_val = app_state.book_options[book_for_review]
 
                 # Temporary review object
                 from dataclasses import dataclass
@@ -1232,17 +1438,17 @@ elif menu == "Functional Patterns":
 
     with pipeline_col1:
         pipeline_user = st.selectbox("User (pipeline):",
-                                     [f"{u.id}: {u.name}" for u in users_data],
+                                     list(app_state.user_options),
                                      key="pipeline_user")
         pipeline_book = st.selectbox("Book (pipeline):",
-                                     [f"{b.id}: {b.title}" for b in books_data],
+                                     list(app_state.book_options),
                                      key="pipeline_book")
         pipeline_rating = st.slider("Rating (pipeline):", 1, 5, 4, key="pipeline_rating")
 
     with pipeline_col2:
         if st.button("Run Pipeline", key="pipeline_button"):
-            user_id_val = pipeline_user.split(":")[0].strip()
-            book_id_val = pipeline_book.split(":")[0].strip()
+            user_id_val = app_state.user_options[pipeline_user]
+            book_id_val = app_state.book_options[pipeline_book]
 
             new_rating = Rating(user_id_val, book_id_val, pipeline_rating)
 
@@ -1255,7 +1461,7 @@ elif menu == "Functional Patterns":
 
                     # Display updated averages
                     if hasattr(calculate_avg_rating_safe, '__call__'):
-                        avg_maybe = calculate_avg_rating_safe(ratings_data, book_id_val)
+                        avg_maybe = cached_avg_rating(book_id_val)
                         new_avg_maybe = calculate_avg_rating_safe(
                             pipeline_result.value, book_id_val
                         )
@@ -1318,27 +1524,36 @@ elif menu == "Lazy Computations":
         k_value = st.slider("Number of top items (K):", 1, 20, 5)
         st.write("**Simulated Book Score Stream:**")
 
-        # Generate sample stream
-        sample_stream = []
-        for i, book in enumerate(books_data[:15]):
-            score = book.rating + (i * 0.1)  # Simple scoring
-            sample_stream.append((f"{book.title}", score))
+        # Generate sample stream (once - it depends on neither K nor the button)
+        @st.cache_resource
+        def sample_score_stream():
+            return tuple(
+                (book.title, book.rating + (i * 0.1))  # Simple scoring
+                for i, book in enumerate(books_data[:15])
+            )
+
+
+        sample_stream = sample_score_stream()
 
     with col2:
         if st.button("Run Streaming Top-K"):
             st.write("**Stream Processing Steps:**")
 
-            steps = list(lazy_top_k(sample_stream, k_value))
+            # Consume the stream lazily, keeping only the last few snapshots for display
+            recent_steps = deque(enumerate(lazy_top_k(sample_stream, k_value), 1), maxlen=5)
 
-            for step, top_items in enumerate(steps):
-                st.write(f"**Step {step + 1}:**")
+            if recent_steps and recent_steps[0][0] > 1:
+                st.caption(f"Showing the last {len(recent_steps)} of {recent_steps[-1][0]} top-K updates")
+            for step, top_items in recent_steps:
+                st.write(f"**Step {step}:**")
                 for rank, (book_title, score) in enumerate(top_items, 1):
                     st.write(f"#{rank}: {book_title} - ⭐{score:.2f}")
                 st.write("---")
 
-            st.success(f"🎯 Final Top-{k_value} Recommendations")
-            for rank, (book_title, score) in enumerate(steps[-1], 1):
-                st.write(f"**#{rank}:** {book_title} - ⭐{score:.2f}")
+            if recent_steps:
+                st.success(f"🎯 Final Top-{k_value} Recommendations")
+                for rank, (book_title, score) in enumerate(recent_steps[-1][1], 1):
+                    st.write(f"**#{rank}:** {book_title} - ⭐{score:.2f}")
 
     # Lazy Search Demonstration
     st.subheader("🔍 Lazy Book Search")
@@ -1466,16 +1681,16 @@ elif menu == "Async/FRP":
 
         with st.form("rating_event_form"):
             rating_user = st.selectbox("User:",
-                                       [f"{u.id}: {u.name}" for u in users_data],
+                                       list(app_state.user_options),
                                        key="rating_event_user")
             rating_book = st.selectbox("Book:",
-                                       [f"{b.id}: {b.title}" for b in books_data],
+                                       list(app_state.book_options),
                                        key="rating_event_book")
             rating_value = st.slider("Rating:", 1, 5, 5, key="rating_event_value")
 
             if st.form_submit_button("📊 Publish RATING_ADDED"):
-                user_id = rating_user.split(":")[0].strip()
-                book_id = rating_book.split(":")[0].strip()
+                user_id = app_state.user_options[rating_user]
+                book_id = app_state.book_options[rating_book]
 
                 payload = {
                     'user_id': user_id,
@@ -1492,16 +1707,16 @@ elif menu == "Async/FRP":
 
         with st.form("loan_event_form"):
             loan_user = st.selectbox("User:",
-                                     [f"{u.id}: {u.name}" for u in users_data],
+                                     list(app_state.user_options),
                                      key="loan_event_user")
             loan_book = st.selectbox("Book:",
-                                     [f"{b.id}: {b.title}" for b in books_data],
+                                     list(app_state.book_options),
                                      key="loan_event_book")
             loan_duration = st.slider("Loan Duration (days):", 1, 30, 14)
 
             if st.form_submit_button("📚 Publish LOAN_ISSUED"):
-                user_id = loan_user.split(":")[0].strip()
-                book_id = loan_book.split(":")[0].strip()
+                user_id = app_state.user_options[loan_user]
+                book_id = app_state.book_options[loan_book]
 
                 from datetime import datetime, timedelta
 
@@ -1526,10 +1741,10 @@ elif menu == "Async/FRP":
 
         with review_col1:
             review_user = st.selectbox("User:",
-                                       [f"{u.id}: {u.name}" for u in users_data],
+                                       list(app_state.user_options),
                                        key="review_event_user")
             review_book = st.selectbox("Book:",
-                                       [f"{b.id}: {b.title}" for b in books_data],
+                                       list(app_state.book_options),
                                        key="review_event_book")
 
         with review_col2:
@@ -1538,8 +1753,8 @@ elif menu == "Async/FRP":
                                        key="review_event_text")
 
         if st.form_submit_button("📝 Publish REVIEW_ADDED"):
-            user_id = review_user.split(":")[0].strip()
-            book_id = review_book.split(":")[0].strip()
+            user_id = app_state.user_options[review_user]
+            book_id = app_state.book_options[review_book]
 
             payload = {
                 'user_id': user_id,
@@ -1604,7 +1819,7 @@ elif menu == "Async/FRP":
 
         if popular_books:
             for i, (book_id, score) in enumerate(list(popular_books.items())[:5], 1):
-                book = next((b for b in books_data if b.id == book_id), None)
+                book = st.session_state.event_handlers.books_by_id.get(book_id)
                 if book:
                     st.write(f"{i}. {book.title} - Score: {score}")
         else:
@@ -1616,7 +1831,7 @@ elif menu == "Async/FRP":
 
         if user_activity:
             for user_id, activity in list(user_activity.items())[:3]:
-                user = next((u for u in users_data if u.id == user_id), None)
+                user = st.session_state.event_handlers.users_by_id.get(user_id)
                 if user:
                     st.write(f"**{user.name}**:")
                     st.write(f"  📊 Ratings: {activity.get('rating_count', 0)}")
@@ -1630,8 +1845,8 @@ elif menu == "Async/FRP":
 
         if recent_loans:
             for loan in recent_loans[:3]:
-                user = next((u for u in users_data if u.id == loan['user_id']), None)
-                book = next((b for b in books_data if b.id == loan['book_id']), None)
+                user = st.session_state.event_handlers.users_by_id.get(loan['user_id'])
+                book = st.session_state.event_handlers.books_by_id.get(loan['book_id'])
                 if user and book:
                     st.write(f"**{user.name}** borrowed **{book.title}**")
                     st.write(f"Date: {loan.get('loan_date', 'Unknown')}")
@@ -1677,6 +1892,7 @@ elif menu == "Async/FRP":
             # Generate sample events for demonstration
             sample_users = users_data[:3]
             sample_books = books_data[:5]
+            sample_events = []
 
             for user in sample_users:
                 for book in sample_books[:2]:
@@ -1687,7 +1903,7 @@ elif menu == "Async/FRP":
                         'rating_value': 4,
                         'timestamp': time.time()
                     }
-                    event_bus.publish("RATING_ADDED", rating_payload)
+                    sample_events.append(("RATING_ADDED", rating_payload))
 
                     # Loan event
                     loan_payload = {
@@ -1696,7 +1912,9 @@ elif menu == "Async/FRP":
                         'loan_date': "2024-01-15",
                         'due_date': "2024-01-29"
                     }
-                    event_bus.publish("LOAN_ISSUED", loan_payload)
+                    sample_events.append(("LOAN_ISSUED", loan_payload))
+
+            event_bus.publish_batch(sample_events)
 
             st.success("Sample events generated! Check the dashboards.")
             st.rerun()
@@ -1786,7 +2004,7 @@ elif menu == "Functional Core · Pipelines · Reports":
 
         st.write("**Most Active Users:**")
         for user_id, activity in report.active_users:
-            user = next((u for u in users_data if u.id == user_id), None)
+            user = app_state.users_by_id.get(user_id)
             if user:
                 st.write(f"- {user.name}: {activity} ratings")
 
@@ -1798,7 +2016,7 @@ elif menu == "Functional Core · Pipelines · Reports":
     with rec_col1:
         st.write("**User Selection & Basic Recommendations**")
 
-        user_options = {f"{user.id}: {user.name}": user.id for user in users_data}
+        user_options = app_state.user_options
         selected_user = st.selectbox("Select User:", list(user_options.keys()))
         user_id = user_options[selected_user]
 
@@ -2052,7 +2270,7 @@ elif menu == "Parallel Recommendations":
     st.subheader("👥 Select User Group")
 
     # Display all available users 显示所有可用用户
-    available_users = [f"{user.id}: {user.name}" for user in users_data]
+    available_users = list(app_state.user_options)
 
     col1, col2 = st.columns(2)
 
@@ -2088,7 +2306,7 @@ elif menu == "Parallel Recommendations":
                                          help="Ensure fair testing")
 
     # Prepare user ID list (this needs to be defined before the button click)
-    user_ids = [user.split(":")[0].strip() for user in selected_users]
+    user_ids = [app_state.user_options[user] for user in selected_users]
 
     # Execute button  执行按钮
     if st.button("🎯 Start Parallel Recommendation Calculation", use_container_width=True):
@@ -2105,7 +2323,7 @@ elif menu == "Parallel Recommendations":
 
                 report = asyncio.run(
                     st.session_state.async_service.generate_parallel_report(
-                        user_ids, tuple(ratings_data), tuple(books_data), k_recommendations
+                        user_ids, ratings_data, books_data, k_recommendations
                     )
                 )
 
@@ -2232,8 +2450,8 @@ elif menu == "Parallel Recommendations":
                         benchmark_results = asyncio.run(
                             benchmark_recommendations(
                                 benchmark_user_ids,
-                                tuple(ratings_data),
-                                tuple(books_data),
+                                ratings_data,
+                                books_data,
                                 k_recommendations
                             )
                         )
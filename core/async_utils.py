@@ -1,5 +1,7 @@
 import asyncio
 import concurrent.futures
+import heapq
+import operator
 import os
 import time
 import logging
@@ -397,7 +399,7 @@ class AsyncRecoService:
                 book_recommendation_count[rec.book_id] = book_recommendation_count.get(rec.book_id, 0) + 1
 
         top_books = []
-        for book_id, count in sorted(book_recommendation_count.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for book_id, count in heapq.nlargest(5, book_recommendation_count.items(), key=operator.itemgetter(1)):
             book = next((b for b in books if b.id == book_id), None)
             if book:
                 top_books.append({
@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass
 from typing import Optional, List
 
@@ -10,6 +11,13 @@ class Book:
     year: int
     rating: float
 
+    def __post_init__(self):
+        """Intern genre and author so repeated equality checks hit the identity fast path"""
+        if type(self.genre) is str:
+            object.__setattr__(self, 'genre', sys.intern(self.genre))
+        if type(self.author) is str:
+            object.__setattr__(self, 'author', sys.intern(self.author))
+
 @dataclass(frozen=True)
 class User:
     id: str
@@ -1,7 +1,14 @@
-from typing import NamedTuple, Callable, Dict, List, Any, Optional
+from collections import Counter, defaultdict, deque
+from typing import (
+    NamedTuple, Callable, Deque, Dict, Iterable, List, Tuple, Any, Optional
+)
+import asyncio
 from dataclasses import dataclass
 from functools import wraps
+import heapq
+import operator
 import time
+import weakref
 
 
 class Event(NamedTuple):
@@ -10,10 +17,77 @@ class Event(NamedTuple):
     timestamp: float
 
 
+_CLOSED = object()  # queued by AsyncSubscription.close() to wake a waiting consumer
+
+
+def _discard_queue(queues: List[asyncio.Queue], queue: asyncio.Queue) -> None:
+    try:
+        queues.remove(queue)
+    except ValueError:
+        pass
+
+
+class AsyncSubscription:
+    """Async iterator of event batches returned by EventBus.subscribe_async.
+
+    The bus only holds the queue, not this object, so a weakref finalizer can
+    unregister the queue once the subscription is closed or garbage collected.
+    """
+
+    def __init__(self, queues: List[asyncio.Queue], max_batch: int, max_pending: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._max_batch = max_batch
+        queues.append(self._queue)
+        self._finalizer = weakref.finalize(self, _discard_queue, queues, self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """Unregister from the bus; further iteration stops, waking a waiting consumer"""
+        if self.closed:
+            return
+        self._finalizer()
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_CLOSED)
+
+    async def aclose(self) -> None:
+        self.close()
+
+    def __aiter__(self) -> "AsyncSubscription":
+        return self
+
+    async def __anext__(self) -> List[Event]:
+        if self.closed:
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise StopAsyncIteration
+        batch = [event]
+        while len(batch) < self._max_batch and not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is _CLOSED:
+                break
+            batch.append(event)
+        return batch
+
+    async def __aenter__(self) -> "AsyncSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
 class EventBus:
-    def __init__(self):
+    def __init__(self, max_history: int = 10_000):
         self._subscribers: Dict[str, List[Callable[[Event], None]]] = {}
-        self._event_history: List[Event] = []
+        # Bounded so a long-running session does not grow without limit
+        self._event_history: Deque[Event] = deque(maxlen=max_history)
+        # Async consumers: per-type queues and one-shot wait_for futures
+        self._queues: Dict[str, List[asyncio.Queue]] = {}
+        self._waiters: Dict[str, List[Tuple[asyncio.Future, Optional[Callable[[Event], bool]]]]] = {}
 
     def subscribe(self, event_type: str, handler: Callable[[Event], None]) -> None:
         """Subscribe handler to event type"""
@@ -32,6 +106,7 @@ class EventBus:
         """Publish event to all subscribers"""
         event = Event(event_type, payload, time.time())
         self._event_history.append(event)
+        self._deliver_async(event)
 
         if event_type in self._subscribers:
             for handler in self._subscribers[event_type]:
@@ -40,9 +115,77 @@ class EventBus:
                 except Exception as e:
                     print(f"Error in event handler: {e}")
 
+    def publish_batch(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Publish several (event_type, payload) pairs at once.
+
+        Same as calling publish() for each pair in order: every event gets its
+        own timestamp and handlers see events in publish order, even across
+        types. Subscriber lists are only looked up once per type per batch.
+        """
+        handlers_by_type: Dict[str, List[Callable[[Event], None]]] = {}
+        for event_type, payload in events:
+            event = Event(event_type, payload, time.time())
+            self._event_history.append(event)
+            self._deliver_async(event)
+
+            handlers = handlers_by_type.get(event_type)
+            if handlers is None:
+                handlers = handlers_by_type[event_type] = self._subscribers.get(event_type, [])
+            for handler in handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Error in event handler: {e}")
+
+    def subscribe_async(self, event_type: str, max_batch: int = 128,
+                        max_pending: int = 1024) -> "AsyncSubscription":
+        """Subscribe an async consumer; iterate the result to receive event batches.
+
+        The queue is registered immediately, so events published before the
+        first iteration are not lost. Each batch holds every event already
+        queued (up to max_batch), so a slow consumer catches up in chunks
+        instead of one await per event. At most max_pending events are kept;
+        beyond that the oldest are dropped. Release the subscription with
+        close()/aclose() or `async with`; one that is simply dropped is
+        unregistered when garbage collected. Publish from the event loop's thread.
+        """
+        return AsyncSubscription(self._queues.setdefault(event_type, []), max_batch, max_pending)
+
+    async def wait_for(self, event_type: str,
+                       check: Optional[Callable[[Event], bool]] = None,
+                       timeout: Optional[float] = None) -> Event:
+        """Wait for the next event of a type (matching check, if given).
+
+        Raises asyncio.TimeoutError if nothing matches within timeout seconds.
+        """
+        future = asyncio.get_running_loop().create_future()
+        waiter = (future, check)
+        self._waiters.setdefault(event_type, []).append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._waiters[event_type].remove(waiter)
+
+    def _deliver_async(self, event: Event) -> None:
+        for queue in self._queues.get(event.name, ()):
+            if queue.full():
+                queue.get_nowait()  # 有界队列：丢弃最旧的事件，与事件历史一致
+            queue.put_nowait(event)
+        for future, check in self._waiters.get(event.name, ()):
+            if future.done():
+                continue
+            try:
+                matched = check is None or check(event)
+            except Exception as exc:
+                # A failing check belongs to its waiter, not to the publisher
+                future.set_exception(exc)
+                continue
+            if matched:
+                future.set_result(event)
+
     def get_event_history(self) -> List[Event]:
-        """Get all published events"""
-        return self._event_history.copy()
+        """Get retained published events (oldest first)"""
+        return list(self._event_history)
 
     def clear_history(self) -> None:
         """Clear event history"""
@@ -86,40 +229,40 @@ class LoanReturnedPayload:
     loan_duration_days: int
 
 
+def _new_user_activity():
+    return {'rating_count': 0, 'review_count': 0, 'loan_count': 0, 'last_activity': 0}
+
+
 # Pure event handlers for state transformation
 class EventHandlers:
     def __init__(self, books, users, ratings):
         self.books = books
         self.users = users
         self.ratings = ratings
+        # id indices so event handlers avoid a linear scan per event
+        self.books_by_id = {b.id: b for b in books}
+        self.users_by_id = {u.id: u for u in users}
         self.state = {
-            'weekly_top_genres': {},
+            'weekly_top_genres': Counter(),
             'new_arrivals': [],
-            'user_activity': {},
+            'user_activity': defaultdict(_new_user_activity),
             'popular_books': {},
             'recent_loans': []
         }
+        self._top_genres = {}
 
     # 纯函数处理事件，返回新状态
     def update_weekly_top_genres(self, event: Event) -> Dict[str, Any]:
         """Update weekly top genres based on ratings"""
-        if event.name == "RATING_ADDED":
-            book_id = event.payload.get('book_id')
-            book = next((b for b in self.books if b.id == book_id), None)
+        if event.name != "RATING_ADDED":
+            return self._top_genres
 
-            if book:
-                genre = book.genre
-                self.state['weekly_top_genres'][genre] = \
-                    self.state['weekly_top_genres'].get(genre, 0) + 1
-
-        # Sort by count descending
-        sorted_genres = sorted(
-            self.state['weekly_top_genres'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
-        return dict(sorted_genres[:5])
+        book = self.books_by_id.get(event.payload.get('book_id'))
+        if book:
+            self.state['weekly_top_genres'][book.genre] += 1
+            # Top 5 by count descending, recomputed only when a count changes
+            self._top_genres = dict(self.state['weekly_top_genres'].most_common(5))
+        return self._top_genres
 
     def update_new_arrivals(self, event: Event) -> List[Dict[str, Any]]:
         """Track newly added books (simulated)"""
@@ -132,12 +275,12 @@ class EventHandlers:
                 'timestamp': event.timestamp
             })
 
-        # Keep only last 10 arrivals
-        self.state['new_arrivals'] = sorted(
-            self.state['new_arrivals'],
-            key=lambda x: x['timestamp'],
-            reverse=True
-        )[:10]
+            # Keep only last 10 arrivals
+            self.state['new_arrivals'] = heapq.nlargest(
+                10,
+                self.state['new_arrivals'],
+                key=operator.itemgetter('timestamp')
+            )
 
         return self.state['new_arrivals']
 
@@ -146,12 +289,7 @@ class EventHandlers:
         user_id = event.payload.get('user_id')
 
         if user_id:
-            user_activity = self.state['user_activity'].get(user_id, {
-                'rating_count': 0,
-                'review_count': 0,
-                'loan_count': 0,
-                'last_activity': 0
-            })
+            user_activity = self.state['user_activity'][user_id]
 
             if event.name == "RATING_ADDED":
                 user_activity['rating_count'] += 1
@@ -161,7 +299,6 @@ class EventHandlers:
                 user_activity['loan_count'] += 1
 
             user_activity['last_activity'] = event.timestamp
-            self.state['user_activity'][user_id] = user_activity
 
         return self.state['user_activity']
 
@@ -177,11 +314,11 @@ class EventHandlers:
                 elif event.name == "LOAN_ISSUED":
                     self.state['popular_books'][book_id] = current_score + 1
 
-        return dict(sorted(
+        return dict(heapq.nlargest(
+            10,
             self.state['popular_books'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10])
+            key=operator.itemgetter(1)
+        ))
 
     def update_recent_loans(self, event: Event) -> List[Dict[str, Any]]:
         """Track recent loan activity"""
@@ -194,12 +331,12 @@ class EventHandlers:
             }
             self.state['recent_loans'].append(loan_data)
 
-        # Keep only last 15 loans
-        self.state['recent_loans'] = sorted(
-            self.state['recent_loans'],
-            key=lambda x: x['timestamp'],
-            reverse=True
-        )[:15]
+            # Keep only last 15 loans
+            self.state['recent_loans'] = heapq.nlargest(
+                15,
+                self.state['recent_loans'],
+                key=operator.itemgetter('timestamp')
+            )
 
         return self.state['recent_loans']
 
@@ -66,7 +66,8 @@ def create_advanced_search(
 
     # 使用lambda处理多个类型
     if genres:
-        genre_lambda = lambda book: any(genre.lower() == book.genre.lower() for genre in genres)
+        genres_lc = frozenset(genre.lower() for genre in genres)
+        genre_lambda = lambda book: book.genre.lower() in genres_lc
         filters.append(genre_lambda)
 
     # 评分过滤
@@ -82,11 +83,12 @@ def create_advanced_search(
         author_lambda = lambda book: any(author.lower() in book.author.lower() for author in authors)
         filters.append(author_lambda)
 
+    combined = combine_filters(*filters)
+
     def search_function(books: Tuple[Book, ...]) -> Tuple[Book, ...]:
         if not filters:
             return books
 
-        combined = combine_filters(*filters)
         return tuple(filter(combined, books))
 
     return search_function
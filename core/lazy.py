@@ -1,5 +1,8 @@
 # core/lazy.py
+import bisect
 import heapq
+import itertools
+import re
 from typing import Iterable, Iterator, Tuple, List, Callable, Any
 from typing import Iterable, Iterator, Tuple, Callable, List, Optional
 from dataclasses import dataclass
@@ -76,23 +79,24 @@ def lazy_top_k(stream: Iterable[Tuple[str, float]], k: int) -> Iterator[Tuple[st
         k: Number of top items to maintain
 
     Yields:
-        Current top-k items after processing each element (for demonstration)
+        Current top-k items whenever an element enters the top-k
         Final result is the last yielded value
     """
-    heap = []  # min-heap for top-k items
+    window = []  # ascending (score, item_id) pairs, smallest first like a min-heap
 
     for item_id, score in stream:
-        # Use negative score for min-heap behavior
-        if len(heap) < k:
-            heapq.heappush(heap, (score, item_id))
-        else:
+        if len(window) < k:
+            bisect.insort(window, (score, item_id))
+        elif window and score > window[0][0]:
             # Replace the smallest if current is larger
-            if score > heap[0][0]:
-                heapq.heappushpop(heap, (score, item_id))
+            del window[0]
+            bisect.insort(window, (score, item_id))
+        else:
+            # Top-k unchanged, nothing new to report
+            continue
 
-        # Yield current state for demonstration
-        current_top = sorted(heap, reverse=True)
-        yield [(item_id, score) for score, item_id in current_top]
+        # Window is already ordered, so the snapshot needs no sort
+        yield [(top_id, top_score) for top_score, top_id in reversed(window)]
 
 
 def lazy_book_recommendations(books: Iterable[Book],
@@ -128,10 +132,8 @@ def lazy_book_recommendations(books: Iterable[Book],
 
         scored_books.append((book, score))
 
-    # Sort and yield top-k
-    scored_books.sort(key=lambda x: x[1], reverse=True)
-
-    for i, (book, score) in enumerate(scored_books[:k]):
+    # Select and yield top-k without sorting every scored book
+    for book, score in heapq.nlargest(k, scored_books, key=lambda x: x[1]):
         yield book, score
 
 
@@ -149,18 +151,19 @@ def lazy_book_search(books: Iterable[Book],
     Yields:
         Books matching search criteria
     """
+    # Lowercase the terms once and compile them into a single alternation,
+    # so each title/author is scanned once instead of once per term
+    terms_lc = [term.lower() for term in search_terms]
+    if not terms_lc:
+        return
+    matcher = re.compile("|".join(map(re.escape, terms_lc)))
+
     for book in books:
         if book.rating < min_rating:
             continue
 
         # Check if any search term matches title or author
-        matches = any(
-            term.lower() in book.title.lower() or
-            term.lower() in book.author.lower()
-            for term in search_terms
-        )
-
-        if matches:
+        if matcher.search(book.title.lower()) or matcher.search(book.author.lower()):
             yield book
 
 
@@ -178,20 +181,11 @@ def batch_process_books(books: Iterable[Book],
     Yields:
         Results from processing each batch
     """
-    batch = []
-
-    for book in books:
-        batch.append(book)
-
-        if len(batch) >= batch_size:
-            result = process_func(batch) if process_func else batch
-            yield result
-            batch = []
+    it = iter(books)
 
-    # Process remaining books
-    if batch:
-        result = process_func(batch) if process_func else batch
-        yield result
+    # islice pulls each batch in one C-level call; the last one may be short
+    while batch := list(itertools.islice(it, batch_size)):
+        yield process_func(batch) if process_func else batch
 
 
 # Test functions
@@ -2,7 +2,7 @@ from functools import lru_cache
 from typing import Tuple
 import time
 from core.domain import Book, Rating, User
-from core.transforms import avg_rating_for_book
+from core.transforms import avg_ratings_by_book
 
 #Recommendation Function
 def calculate_user_profile(user_id: str, ratings: Tuple[Rating, ...], books: Tuple[Book, ...]) -> dict:
@@ -13,12 +13,13 @@ def calculate_user_profile(user_id: str, ratings: Tuple[Rating, ...], books: Tup
     preferred_authors = set()
     preferred_genres = set()
 
-    for rating in user_ratings:
-        if rating.value >= 4:  # 只考虑高评分
-            book = next((b for b in books if b.id == rating.book_id), None)
-            if book:
-                preferred_authors.add(book.author)
-                preferred_genres.add(book.genre)
+    # 只考虑高评分；一次遍历书籍，而不是每条评分扫描一次
+    liked_ids = {r.book_id for r in user_ratings if r.value >= 4}
+    for book in books:
+        if book.id in liked_ids:
+            liked_ids.discard(book.id)  # 与原先一样，只取第一本匹配的书
+            preferred_authors.add(book.author)
+            preferred_genres.add(book.genre)
 
     return {
         'preferred_authors': tuple(preferred_authors),
@@ -44,31 +45,63 @@ def calculate_book_similarity(book: Book, user_profile: dict) -> float:
 
     return score / max_possible if max_possible > 0 else 0
 
+
 #Memoization Implementation
-@lru_cache(maxsize=128)
+class _FingerprintKey:
+    """缓存键：用 (长度, 最后一项) 做廉价哈希，只有哈希相同时才比较完整内容"""
+    __slots__ = ('data', '_hash')
+
+    def __init__(self, data: tuple):
+        self.data = data
+        self._hash = hash((len(data), data[-1] if data else None))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, _FingerprintKey) and (
+            self.data is other.data or self.data == other.data
+        )
+
+
 def recommend_for_user_cached(
         user_id: str,
         ratings_index: Tuple[Rating, ...],
         books_index: Tuple[Book, ...]
 ) -> Tuple[Tuple[str, str, str, str, float], ...]:
-    """Content-based recommendation algorithm (with cache"""
+    """Content-based recommendation algorithm (with cache)
+
+    The lru_cache key wraps both tuples in a fingerprint key, so a lookup no
+    longer hashes every Rating and Book on each call.
+    """
+    return _recommend_inner(user_id, _FingerprintKey(ratings_index), _FingerprintKey(books_index))
+
+
+@lru_cache(maxsize=128)
+def _recommend_inner(user_id: str, ratings_key: _FingerprintKey, books_key: _FingerprintKey):
+    ratings_index, books_index = ratings_key.data, books_key.data
     start_time = time.time()
     #Content-based algorithm
     user_profile = calculate_user_profile(user_id, ratings_index, books_index)
 
     # Exclude rated books
-    unrated_books = [b for b in books_index if b.id not in user_profile['rated_books']]
-
-    # 计算每本书的推荐分数
-    book_scores = []
-    for book in unrated_books:
-        similarity = calculate_book_similarity(book, user_profile)
+    rated_ids = set(user_profile['rated_books'])
+    unrated_books = [b for b in books_index if b.id not in rated_ids]
 
-        # 结合书籍的平均评分
-        avg_rating = avg_rating_for_book(ratings_index, book.id)
-        final_score = similarity * 0.7 + (avg_rating / 5.0) * 0.3
+    # 所有书的平均评分一次算好，避免每本书都扫描全部评分
+    avg_ratings = avg_ratings_by_book(ratings_index)
 
-        book_scores.append((book.id, book.title, book.author, book.genre, final_score))
+    # 计算每本书的推荐分数；画像转成集合，相似度查找不再线性扫描元组
+    match_profile = {
+        'preferred_authors': frozenset(user_profile['preferred_authors']),
+        'preferred_genres': frozenset(user_profile['preferred_genres']),
+    }
+    book_scores = [
+        (book.id, book.title, book.author, book.genre,
+         calculate_book_similarity(book, match_profile) * 0.7
+         + (avg_ratings.get(book.id, 0.0) / 5.0) * 0.3)  # 结合书籍的平均评分
+        for book in unrated_books
+    ]
 
     # 按分数排序，返回前10本
     book_scores.sort(key=lambda x: x[4], reverse=True)  # 按分数排序
@@ -87,15 +120,15 @@ def recommend_for_user_uncached(
 ) -> Tuple[Tuple[str, str, str, str, float], ...]:
     """无缓存版本的推荐算法（用于性能对比）"""
     # 清除缓存以确保公平比较
-    recommend_for_user_cached.cache_clear()
+    _recommend_inner.cache_clear()
     return recommend_for_user_cached(user_id, ratings_index, books_index)
 
 
 def get_cache_info():
     """获取缓存信息"""
-    return recommend_for_user_cached.cache_info()
+    return _recommend_inner.cache_info()
 
 
 def clear_cache():
     """清除缓存"""
-    recommend_for_user_cached.cache_clear()
\ No newline at end of file
+    _recommend_inner.cache_clear()
\ No newline at end of file
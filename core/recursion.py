@@ -38,13 +38,18 @@ def find_all_tags(tag: Tag) -> List[Tag]:
 
 
 def find_tag_by_name(tag: Tag, name: str) -> Optional[Tag]:
+    # 目标名只小写一次，递归部分比较的都是已规范化的名字
+    return _find_tag_lower(tag, name.lower())
 
-    if tag.name.lower() == name.lower():
+
+def _find_tag_lower(tag: Tag, target: str) -> Optional[Tag]:
+
+    if tag.name.lower() == target:
         return tag
 
     if tag.children:
         for child in tag.children:
-            result = find_tag_by_name(child, name)
+            result = _find_tag_lower(child, target)
             if result is not None:
                 return result
 
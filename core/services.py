@@ -1,3 +1,5 @@
+import heapq
+import operator
 import time
 from typing import Callable, List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
@@ -92,22 +94,14 @@ class LibraryService:
         for book in books:
             genre_counter[book.genre] = genre_counter.get(book.genre, 0) + 1
 
-        popular_genres = sorted(
-            genre_counter.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
+        popular_genres = heapq.nlargest(5, genre_counter.items(), key=operator.itemgetter(1))
 
         # Calculate active users (simplified)
         user_activity = {}
         for rating in ratings:
             user_activity[rating.user_id] = user_activity.get(rating.user_id, 0) + 1
 
-        active_users = sorted(
-            user_activity.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
+        active_users = heapq.nlargest(5, user_activity.items(), key=operator.itemgetter(1))
 
         return DayReport(
             date="2024-01-15",  # Fixed for demo
@@ -421,8 +415,8 @@ class AsyncRecoService:
                     stats["preferred_genres"][book.genre] = stats["preferred_genres"].get(book.genre, 0) + 1
 
         stats["average_ratings_per_user"] = total_ratings / len(user_ids) if user_ids else 0
-        stats["preferred_genres"] = dict(sorted(stats["preferred_genres"].items(),
-                                                key=lambda x: x[1], reverse=True)[:5])
+        stats["preferred_genres"] = dict(heapq.nlargest(5, stats["preferred_genres"].items(),
+                                                        key=operator.itemgetter(1)))
         return stats
 
     def _analyze_recommendation_quality(self, recommendations: Dict[str, List['Recommendation']],
@@ -450,7 +444,7 @@ class AsyncRecoService:
             for rec in recs:
                 unique_genres.add(rec.genre)
 
-        top_books = sorted(book_recommendation_count.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_books = heapq.nlargest(5, book_recommendation_count.items(), key=operator.itemgetter(1))
         top_books_with_titles = []
 
         for book_id, count in top_books:
@@ -31,6 +31,15 @@ def add_rating(ratings: Tuple, new_rating) -> Tuple:
     return ratings + (new_rating,)
 
 
+def avg_ratings_by_book(ratings: Tuple) -> dict:
+    """Average rating for every rated book in one pass (book_id -> avg)"""
+    totals, counts = {}, {}
+    for r in ratings:
+        totals[r.book_id] = totals.get(r.book_id, 0) + r.value
+        counts[r.book_id] = counts.get(r.book_id, 0) + 1
+    return {book_id: totals[book_id] / counts[book_id] for book_id in totals}
+
+
 def avg_rating_for_book(ratings: Tuple, book_id: str) -> float:
     """Calculate average for a specific book"""
     book_ratings = tuple(r for r in ratings if r.book_id == book_id)
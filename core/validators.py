@@ -1,4 +1,4 @@
-from typing import Tuple, List
+from typing import Tuple, List, Union
 from .ftypes import Maybe, Just, Nothing, Either, Right, Left, maybe
 from .domain import Book, Rating, Review, User
 
@@ -82,20 +82,34 @@ def validate_review(review: Review,
 
 
 def add_rating_pipeline(new_rating: Rating,
-                        ratings: Tuple[Rating, ...],
+                        ratings: Union[List[Rating], Tuple[Rating, ...]],
                         books: Tuple[Book, ...],
-                        users: Tuple[User, ...]) -> Either[str, Tuple[Rating, ...]]:
-    """添加评分 + 重新计算平均评分的完整流程"""
+                        users: Tuple[User, ...]) -> Either[str, Union[List[Rating], Tuple[Rating, ...]]]:
+    """添加评分 + 重新计算平均评分的完整流程
+
+    注意：本函数对 list 有副作用。传入 list 时视为可增长缓冲区，验证通过后
+    原地追加（摊销 O(1)）并返回同一个 list；传入 tuple 时保持纯函数语义，
+    原元组不变，返回新元组。验证失败时两者都不会被修改。
+    """
 
     # 验证新评分
     validation_result = validate_rating(new_rating, books, users, ratings)
 
     # 使用bind连接操作：如果验证成功，则添加评分
     return validation_result.bind(
-        lambda valid_rating: Right(ratings + (valid_rating,))
+        lambda valid_rating: Right(_append_rating(ratings, valid_rating))
     )
 
 
+def _append_rating(ratings: Union[List[Rating], Tuple[Rating, ...]],
+                   rating: Rating) -> Union[List[Rating], Tuple[Rating, ...]]:
+    """list 原地追加并返回自身；tuple 返回追加后的新元组"""
+    if isinstance(ratings, list):
+        ratings.append(rating)
+        return ratings
+    return ratings + (rating,)
+
+
 def add_review_pipeline(new_review: Review,
                         reviews: Tuple[Review, ...],
                         books: Tuple[Book, ...],
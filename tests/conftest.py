@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# 项目根目录只在 pytest 启动时加入一次路径，各测试文件无需再修改 sys.path。
+# 测试文件不再支持直接以脚本运行，请使用：python -m pytest tests/test_labN.py
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
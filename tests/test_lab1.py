@@ -1,7 +1,6 @@
-import sys
-import os
+from dataclasses import FrozenInstanceError
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
 from core.domain import Book, User, Rating
 from core.transforms import *
@@ -25,25 +24,19 @@ def test_lab1_simple():
     rating = Rating("u1", "1", 5)
 
 
-    try:
+    with pytest.raises(FrozenInstanceError):
         book.title = "New Title"
-        print("   ❌ FAIL: Book should be immutable")
-    except:
-        print("   ✅ PASS: Book is immutable")
+    print("   ✅ PASS: Book is immutable")
 
 
-    try:
+    with pytest.raises(FrozenInstanceError):
         user.name = "New Name"
-        print("   ❌ FAIL: User should be immutable")
-    except:
-        print("   ✅ PASS: User is immutable")
+    print("   ✅ PASS: User is immutable")
 
 
-    try:
+    with pytest.raises(FrozenInstanceError):
         rating.value = 3
-        print("   ❌ FAIL: Rating should be immutable")
-    except:
-        print("   ✅ PASS: Rating is immutable")
+    print("   ✅ PASS: Rating is immutable")
 
     #pure function Filter
     print("2. 🔍 Testing Pure Function - Filter by Year...")
@@ -86,7 +79,3 @@ def test_lab1_simple():
     print("   ✅ Pure Functions (no side effects)")
     print("   ✅ Higher-Order Functions (Map/Filter/Reduce)")
     print("   ✅ Functional Programming Style")
-
-
-if __name__ == "__main__":
-    test_lab1_simple()
\ No newline at end of file
@@ -1,24 +1,10 @@
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
+import pytest
 
-
-@dataclass
-class Tag:
-    id: str
-    name: str
-    parent_id: Optional[str] = None
-    children: List['Tag'] = None
-
-
-@dataclass(frozen=True)
-class Book:
-    id: str
-    title: str
-    author: str
-    genre: str
-    year: int
-    rating: float
+from core.domain import Book
+from core.recursion import Tag
 
 
 def create_genre_filter(genre: str):
@@ -49,52 +35,46 @@ def combine_filters(*filters):
 
 
 def find_tag_by_name(tag: Tag, name: str) -> Optional[Tag]:
-    """Recursive Algorithm 1: Tag Search"""
-    if tag.name.lower() == name.lower():
-        return tag
-    if tag.children:
-        for child in tag.children:
-            result = find_tag_by_name(child, name)
-            if result:
-                return result
+    """Tag Search: breadth-first over the taxonomy, no recursion depth limit"""
+    target = name.lower()
+    queue = deque([tag])
+    while queue:
+        current = queue.popleft()
+        if current.name.lower() == target:
+            return current
+        if current.children:
+            queue.extend(current.children)
     return None
 
 
-def find_related_books(book: Book, all_books: Tuple[Book, ...]) -> Tuple[Book, ...]:
-
+def build_genre_index(books: Tuple[Book, ...]) -> Dict[str, List[Book]]:
+    """Inverted index: genre -> books of that genre, in catalog order"""
+    genre_idx = {}
+    for b in books:
+        genre_idx.setdefault(b.genre, []).append(b)
+    return genre_idx
 
-    def find_similar(current_book, visited):
-        if current_book.id in visited:
-            return []
-        visited.add(current_book.id)
 
-        similar = []
-        for other_book in all_books:
-            if (other_book.id not in visited and
-                    other_book.genre == current_book.genre and
-                    other_book.id != book.id):
-                similar.append(other_book)
-                # 递归查找更多相关书籍
-                visited.add(other_book.id)
-                more_similar = find_similar(other_book, visited)
-                similar.extend(more_similar)
-        return similar
+def find_related_books(book: Book, all_books: Tuple[Book, ...], *,
+                       genre_idx: Optional[Dict[str, List[Book]]] = None) -> Tuple[Book, ...]:
+    """Related books: same genre, excluding the book itself"""
+    if genre_idx is None:
+        genre_idx = build_genre_index(all_books)
+    return tuple(b for b in genre_idx.get(book.genre, ()) if b.id != book.id)
 
-    return tuple(find_similar(book, set()))
 
+# Three Sci-Fi books (two rated 4.6 or higher) and one Fantasy book
+_BOOKS = (
+    Book("1", "Dune", "Frank Herbert", "Sci-Fi", 1965, 4.8),
+    Book("2", "The Hobbit", "J.R.R. Tolkien", "Fantasy", 1937, 4.9),
+    Book("3", "Project Hail Mary", "Andy Weir", "Sci-Fi", 2021, 4.5),
+    Book("4", "Foundation", "Isaac Asimov", "Sci-Fi", 1951, 4.6),
+)
 
-def run_all_tests():
-    """five text"""
-    print("🎯 Running Lab 2 - 5 Core Tests\n")
-
-
-    books = (
-        Book("1", "Dune", "Frank Herbert", "Sci-Fi", 1965, 4.8),
-        Book("2", "The Hobbit", "J.R.R. Tolkien", "Fantasy", 1937, 4.9),
-        Book("3", "Project Hail Mary", "Andy Weir", "Sci-Fi", 2021, 4.5),
-        Book("4", "Foundation", "Isaac Asimov", "Sci-Fi", 1951, 4.6),
-    )
 
+@pytest.fixture
+def tag_tree():
+    """Literature -> Fiction -> (Sci-Fi, Fantasy)；Tag 可变，每个测试重新构建"""
     root = Tag("1", "Literature")
     fiction = Tag("2", "Fiction")
     scifi = Tag("3", "Sci-Fi")
@@ -102,53 +82,43 @@ def run_all_tests():
 
     fiction.children = [scifi, fantasy]
     root.children = [fiction]
+    return root
+
 
-    print("1. 🔄 Testing Closure Filters")
+def test_closure_filters():
+    """Closure filters"""
     sci_fi_filter = create_genre_filter("Sci-Fi")
-    sci_fi_books = tuple(filter(sci_fi_filter, books))
+    sci_fi_books = tuple(filter(sci_fi_filter, _BOOKS))
     assert len(sci_fi_books) == 3, f"Expected 3 Sci-Fi books, got {len(sci_fi_books)}"
-    print("   ✅ PASS: Closure filters work correctly")
 
-    print("2. 🔄 Testing Filter Combination")
-    genre_filter = create_genre_filter("Sci-Fi")
-    rating_filter = create_rating_filter(4.6)
-    combined = combine_filters(genre_filter, rating_filter)
-    filtered_books = tuple(filter(combined, books))
+
+def test_filter_combination():
+    """Higher-order filter combination"""
+    combined = combine_filters(create_genre_filter("Sci-Fi"), create_rating_filter(4.6))
+    filtered_books = tuple(filter(combined, _BOOKS))
     assert len(filtered_books) == 2, f"Expected 2 books, got {len(filtered_books)}"
-    print("   ✅ PASS: Filter combination works correctly")
 
-    # Test 3:Recursive tag search
-    print("3. 🔄 Testing Recursive Tag Search")
-    found_tag = find_tag_by_name(root, "Sci-Fi")
+
+def test_find_tag_by_name(tag_tree):
+    """Tag search (breadth-first, case-insensitive)"""
+    found_tag = find_tag_by_name(tag_tree, "sci-fi")
     assert found_tag is not None, "Should find Sci-Fi tag"
     assert found_tag.name == "Sci-Fi", f"Found wrong tag: {found_tag.name}"
-    print("   ✅ PASS: Recursive tag search works correctly")
-
-    # Test 4:Books on recursion
-    print("4. 🔄 Testing Recursive Related Books")
-    target_book = books[0]  # Dune (Sci-Fi)
-    related = find_related_books(target_book, books)
-    assert len(related) == 2, f"Expected 2 related books, got {len(related)}"
-    assert all(b.genre == "Sci-Fi" for b in related), "All related books should be Sci-Fi"
-    print("   ✅ PASS: Recursive related books works correctly")
-
-    # Test 5: Lambda expression
-    print("5. 🔄 Testing Lambda Expressions")
-    high_rated_sci_fi = list(filter(
-        lambda b: b.genre == "Sci-Fi" and b.rating >= 4.6,
-        books
-    ))
-    assert len(high_rated_sci_fi) == 2, "Lambda filter should find 2 books"
-    print("   ✅ PASS: Lambda expressions work correctly")
-
-    print("\n🎉 SUCCESS! All 5 Lab 2 tests passed!")
-    print("\n📋 Lab 2 Requirements Verified:")
-    print("   ✅ Closures and lambda expressions")
-    print("   ✅ Configurator closures (filter generators)")
-    print("   ✅ 2 recursive algorithms (tag search + related books)")
-    print("   ✅ Higher-order functions (filter combination)")
-    print("   ✅ Functional programming style")
-
-
-if __name__ == "__main__":
-    run_all_tests()
\ No newline at end of file
+    assert find_tag_by_name(tag_tree, "Poetry") is None
+
+
+def test_find_related_books():
+    """Related books, with and without a prebuilt genre index"""
+    target_book = _BOOKS[0]  # Dune (Sci-Fi)
+    genre_idx = build_genre_index(_BOOKS)  # built once, reused by every lookup
+    related = find_related_books(target_book, _BOOKS, genre_idx=genre_idx)
+
+    assert [b.id for b in related] == ["3", "4"]
+    assert find_related_books(target_book, _BOOKS) == related
+    assert find_related_books(_BOOKS[1], _BOOKS) == ()  # Fantasy 只有一本
+
+
+def test_inline_filter_expression():
+    """Inline filter expression"""
+    high_rated_sci_fi = [b for b in _BOOKS if b.genre == "Sci-Fi" and b.rating >= 4.6]
+    assert len(high_rated_sci_fi) == 2, "Inline filter should find 2 books"
@@ -1,10 +1,5 @@
 import pytest
-import time
-import sys
-import os
-
-# 添加项目路径到系统路径
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from time import perf_counter_ns
 
 from core.memo import (
     calculate_user_profile,
@@ -17,32 +12,34 @@ from core.memo import (
 from core.domain import Book, Rating, User
 
 
-@pytest.fixture
-def sample_data():
-    """创建测试数据"""
-    books = [
-        Book("1", "Абай жолы", "Мұхтар Әуезов", "Classic", 1942, 4.8),
-        Book("2", "Қан мен тер", "Әбдіжәміл Нұрпеісов", "Classic", 1970, 4.7),
-        Book("3", "Ақбоз үй", "Ілияс Есенберлин", "History", 1973, 4.7),
-        Book("4", "Қазақ хандығы", "Меруерт Абусеитова", "History", 2005, 4.6),
-    ]
+# u1 只给 Classic 打高分，u2 偏好 History，两人的推荐应当不同
+_BOOKS = (
+    Book("1", "Абай жолы", "Мұхтар Әуезов", "Classic", 1942, 4.8),
+    Book("2", "Қан мен тер", "Әбдіжәміл Нұрпеісов", "Classic", 1970, 4.7),
+    Book("3", "Ақбоз үй", "Ілияс Есенберлин", "History", 1973, 4.7),
+    Book("4", "Қазақ хандығы", "Меруерт Абусеитова", "History", 2005, 4.6),
+)
 
-    users = [User("u1", "Aliya"), User("u2", "Bauyrzhan")]
+_USERS = (User("u1", "Aliya"), User("u2", "Bauyrzhan"))
 
-    ratings = [
-        Rating("u1", "1", 5),  # User1 rates Classic book highly
-        Rating("u1", "2", 4),  # User1 rates another Classic
-        Rating("u2", "3", 5),  # User2 rates History book
-        Rating("u2", "4", 3),  # User2 rates another History lower
-    ]
+_RATINGS = (
+    Rating("u1", "1", 5),  # User1 rates Classic book highly
+    Rating("u1", "2", 4),  # User1 rates another Classic
+    Rating("u2", "3", 5),  # User2 rates History book
+    Rating("u2", "4", 3),  # User2 rates another History lower
+)
 
-    return books, ratings, users
+
+@pytest.fixture(scope="session")
+def sample_data():
+    """创建测试数据"""
+    return _BOOKS, _RATINGS, _USERS
 
 
 def test_calculate_user_profile(sample_data):
     """测试用户画像计算"""
     books, ratings, users = sample_data
-    profile = calculate_user_profile("u1", tuple(ratings), tuple(books))
+    profile = calculate_user_profile("u1", ratings, books)
 
     assert "preferred_authors" in profile
     assert "preferred_genres" in profile
@@ -55,7 +52,7 @@ def test_calculate_user_profile(sample_data):
 def test_calculate_book_similarity(sample_data):
     """测试书籍相似度计算Book Similarity Calculation"""
     books, ratings, users = sample_data
-    user_profile = calculate_user_profile("u1", tuple(ratings), tuple(books))
+    user_profile = calculate_user_profile("u1", ratings, books)
     book = books[0]  # Classic book by preferred author
 
     similarity = calculate_book_similarity(book, user_profile)
@@ -65,7 +62,7 @@ def test_calculate_book_similarity(sample_data):
 def test_recommend_for_user_cached(sample_data):
     """测试带缓存的推荐函数Cached Recommendation Function"""
     books, ratings, users = sample_data
-    recommendations = recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    recommendations = recommend_for_user_cached("u1", ratings, books)
 
     assert isinstance(recommendations, tuple)
     assert len(recommendations) <= 10
@@ -79,19 +76,40 @@ def test_cache_performance(sample_data):
     clear_cache()
 
     # 第一次调用（缓存未命中）
-    start_time = time.time()
-    rec1 = recommend_for_user_cached("u1", tuple(ratings), tuple(books))
-    first_call_time = time.time() - start_time
+    rec1 = recommend_for_user_cached("u1", ratings, books)
+    misses_before = get_cache_info().misses
 
     # 第二次调用（缓存命中）
-    start_time = time.time()
-    rec2 = recommend_for_user_cached("u1", tuple(ratings), tuple(books))
-    second_call_time = time.time() - start_time
+    rec2 = recommend_for_user_cached("u1", ratings, books)
 
-    # 结果应该相同
+    # 结果应该相同，且第二次调用直接命中缓存
     assert rec1 == rec2
-    # 第二次调用应该更快
-    assert second_call_time <= first_call_time * 2  # 允许一些浮动
+    info = get_cache_info()
+    assert info.hits == 1
+    assert info.misses == misses_before
+
+
+def _min_ns(fn, n=100):
+    """取 n 次运行中最快的一次（纳秒），与 timeit 一样排除调度抖动"""
+    best = None
+    for _ in range(n):
+        start = perf_counter_ns()
+        fn()
+        elapsed = perf_counter_ns() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def test_cache_speedup(sample_data):
+    """测试缓存命中明显快于重新计算"""
+    books, ratings, users = sample_data
+
+    uncached_ns = _min_ns(lambda: recommend_for_user_uncached("u1", ratings, books))
+    cached_ns = _min_ns(lambda: recommend_for_user_cached("u1", ratings, books))
+
+    # 命中只需构造缓存键并查表，至少快一倍
+    assert cached_ns * 2 < uncached_ns
 
 
 def test_cache_info(sample_data):
@@ -107,14 +125,14 @@ def test_cache_info(sample_data):
     assert initial_info.misses == 0
 
     # 调用一次
-    recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    recommend_for_user_cached("u1", ratings, books)
 
     # 再次获取缓存信息
     after_info = get_cache_info()
     assert after_info.misses == 1
 
     # 再次调用相同参数
-    recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    recommend_for_user_cached("u1", ratings, books)
 
     final_info = get_cache_info()
     assert final_info.hits == 1
@@ -126,7 +144,7 @@ def test_clear_cache(sample_data):
     books, ratings, users = sample_data
 
     # 先调用一次填充缓存
-    recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    recommend_for_user_cached("u1", ratings, books)
 
     # 清除缓存
     clear_cache()
@@ -139,7 +157,7 @@ def test_clear_cache(sample_data):
 def test_recommendation_structure(sample_data):
     """测试推荐结果结构Recommended Results Structure"""
     books, ratings, users = sample_data
-    recommendations = recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    recommendations = recommend_for_user_cached("u1", ratings, books)
 
     if recommendations:  # 如果有推荐结果
         first_recommendation = recommendations[0]
@@ -156,7 +174,7 @@ def test_user_with_no_ratings(sample_data):
     """测试没有评分的用户Test for users without ratings"""
     books, ratings, users = sample_data
     # 使用一个没有评分的用户
-    recommendations = recommend_for_user_cached("u3", tuple(ratings), tuple(books))
+    recommendations = recommend_for_user_cached("u3", ratings, books)
 
     # 应该返回空结果或默认推荐
     assert isinstance(recommendations, tuple)
@@ -179,14 +197,27 @@ def test_cache_with_different_users(sample_data):
     clear_cache()
 
     # 为用户1生成推荐
-    rec1 = recommend_for_user_cached("u1", tuple(ratings), tuple(books))
+    rec1 = recommend_for_user_cached("u1", ratings, books)
 
     # 为用户2生成推荐
-    rec2 = recommend_for_user_cached("u2", tuple(ratings), tuple(books))
+    rec2 = recommend_for_user_cached("u2", ratings, books)
 
     # 两个推荐应该不同
     assert rec1 != rec2
 
     # 缓存应该有两个条目
     cache_info = get_cache_info()
-    assert cache_info.currsize == 2
\ No newline at end of file
+    assert cache_info.currsize == 2
+
+
+def test_cache_key_distinguishes_same_fingerprint(sample_data):
+    """测试长度和最后一项相同但内容不同的评分不会命中同一缓存"""
+    books, ratings, users = sample_data
+    clear_cache()
+
+    other_ratings = (Rating("u1", "3", 5),) + ratings[1:]
+    rec1 = recommend_for_user_cached("u1", ratings, books)
+    rec2 = recommend_for_user_cached("u1", other_ratings, books)
+
+    assert rec1 != rec2
+    assert get_cache_info().misses == 2
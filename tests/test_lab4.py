@@ -1,9 +1,4 @@
 import pytest
-import sys
-import os
-
-# 添加项目路径到系统路径
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.ftypes import Maybe, Just, Nothing, Either, Right, Left
 from core.validators import (
@@ -14,29 +9,31 @@ from core.validators import (
 from core.domain import Book, Rating, User
 
 
-@pytest.fixture
-def sample_data():
-    """创建测试数据"""
-    books = [
-        Book("1", "Абай жолы", "Мұхтар Әуезов", "Classic", 1942, 4.8),
-        Book("2", "Қан мен тер", "Әбдіжәміл Нұрпеісов", "Classic", 1970, 4.7),
-        Book("3", "Ақбоз үй", "Ілияс Есенберлин", "History", 1973, 4.7),
-        Book("4", "Қазақ хандығы", "Меруерт Абусеитова", "History", 2005, 4.6),
-    ]
+# u3 还没有任何评分，用于添加评分的流程测试
+_BOOKS = (
+    Book("1", "Абай жолы", "Мұхтар Әуезов", "Classic", 1942, 4.8),
+    Book("2", "Қан мен тер", "Әбдіжәміл Нұрпеісов", "Classic", 1970, 4.7),
+    Book("3", "Ақбоз үй", "Ілияс Есенберлин", "History", 1973, 4.7),
+    Book("4", "Қазақ хандығы", "Меруерт Абусеитова", "History", 2005, 4.6),
+)
 
-    users = [
-        User("u1", "Aliya"),
-        User("u2", "Bauyrzhan"),
-        User("u3", "Gani"),
-    ]
+_USERS = (
+    User("u1", "Aliya"),
+    User("u2", "Bauyrzhan"),
+    User("u3", "Gani"),
+)
+
+_RATINGS = (
+    Rating("u1", "1", 5),
+    Rating("u2", "1", 4),
+    Rating("u1", "2", 3),
+)
 
-    ratings = [
-        Rating("u1", "1", 5),
-        Rating("u2", "1", 4),
-        Rating("u1", "2", 3),
-    ]
 
-    return books, users, ratings
+@pytest.fixture(scope="session")
+def sample_data():
+    """创建测试数据"""
+    return _BOOKS, _USERS, _RATINGS
 
 
 # ==================== Maybe 类型测试 ====================
@@ -77,4 +74,25 @@ def test_maybe_map_nothing():
     assert mapped.get_or_else(100) == 100
 
 
+def test_add_rating_pipeline_appends_to_list(sample_data):
+    """测试list评分存储原地追加，tuple返回新元组"""
+    books, users, ratings = sample_data
+    new_rating = Rating("u3", "3", 4)
+
+    stored = list(ratings)
+    result = add_rating_pipeline(new_rating, stored, books, users)
+    assert result.is_right() == True
+    assert result.get_or_else(None) is stored
+    assert stored[-1] == new_rating
+
+    result = add_rating_pipeline(new_rating, ratings, books, users)
+    assert result.get_or_else(None) == ratings + (new_rating,)
+    assert len(ratings) == 3
+
+    # 验证失败时 list 不被修改
+    result = add_rating_pipeline(Rating("u3", "missing", 4), stored, books, users)
+    assert result.is_left() == True
+    assert len(stored) == 4
+
+
 # 继续其他测试方法...
\ No newline at end of file
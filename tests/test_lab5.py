@@ -24,9 +24,16 @@ class TestLazyComputations(unittest.TestCase):
         stream = [("item1", 1.0), ("item2", 3.0), ("item3", 2.0)]
         results = list(lazy_top_k(stream, 2))
 
-        self.assertEqual(len(results), 3)  # One result per stream element
+        self.assertEqual(len(results), 3)  # Each element enters the top-2 here, so each yields a snapshot
         self.assertEqual(len(results[-1]), 2)  # Final top-2
 
+    def test_lazy_top_k_skips_unchanged(self):
+        stream = [("item1", 3.0), ("item2", 2.0), ("item3", 1.0), ("item4", 4.0)]
+        results = list(lazy_top_k(stream, 2))
+
+        self.assertEqual(len(results), 3)  # item3 never enters the top-2
+        self.assertEqual(results[-1], [("item4", 4.0), ("item1", 3.0)])
+
     def test_lazy_top_k_empty(self):
         stream = []
         results = list(lazy_top_k(stream, 3))
@@ -67,19 +74,24 @@ if __name__ == "__main__":
 def test_lazy_computation_memory_efficiency():
     """测试惰性计算的内存效率"""
     import sys
-    from core.lazy import lazy_top_k, lazy_book_search
+    import numpy as np
+    from core.lazy import lazy_top_k
 
-    # 创建大型数据流
-    large_stream = [(f"book_{i}", i * 0.1) for i in range(1000)]
+    # 创建大型数据流（列式存储：id 与分数各占一个连续数组）
+    ids = np.char.add("book_", np.arange(1000).astype("U16"))
+    scores = np.arange(1000, dtype=np.float32) * 0.1
 
-    # 测试惰性top-K的内存使用
-    initial_memory = sys.getsizeof(large_stream)
+    initial_memory = ids.nbytes + scores.nbytes
 
-    top_k_generator = lazy_top_k(large_stream, 10)
-    results = list(top_k_generator)
+    # 按需 zip 成 (id, score)，只保留最后一次 top-K 快照
+    final_top = []
+    for final_top in lazy_top_k(zip(ids, scores), 10):
+        pass
 
-    final_memory = sys.getsizeof(results)
+    final_memory = sys.getsizeof(final_top) + sum(sys.getsizeof(item) for item in final_top)
 
+    assert len(final_top) == 10
+    assert final_top[0][0] == "book_999"
     # 验证惰性处理减少了内存使用
     assert final_memory < initial_memory * 0.5  # 内存使用减少至少50%
 
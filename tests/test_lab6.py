@@ -157,6 +157,171 @@ def test_event_history_persistence(event_bus):
     assert history[2].payload["rating"] == 5
 
 
+def test_event_history_is_bounded():
+    """Test that event bus keeps only the most recent events up to max_history"""
+    bus = EventBus(max_history=3)
+    for i in range(5):
+        bus.publish("BOOK_VIEW", {"book_id": str(i)})
+
+    history = bus.get_event_history()
+
+    assert isinstance(history, list)
+    assert [event.payload["book_id"] for event in history] == ["2", "3", "4"]
+
+
+def test_publish_batch_delivers_events_by_type(event_bus):
+    """Test that a published batch reaches each subscriber and is recorded in order"""
+    ratings_received = []
+    loans_received = []
+    event_bus.subscribe("RATING_ADDED", ratings_received.append)
+    event_bus.subscribe("LOAN_ISSUED", loans_received.append)
+
+    event_bus.publish_batch([
+        ("RATING_ADDED", {"book_id": "1"}),
+        ("LOAN_ISSUED", {"book_id": "2"}),
+        ("RATING_ADDED", {"book_id": "3"}),
+    ])
+
+    assert [e.payload["book_id"] for e in ratings_received] == ["1", "3"]
+    assert [e.payload["book_id"] for e in loans_received] == ["2"]
+    assert [e.name for e in event_bus.get_event_history()] == [
+        "RATING_ADDED", "LOAN_ISSUED", "RATING_ADDED"
+    ]
+
+
+def test_publish_batch_keeps_publish_order_across_types(event_bus):
+    """Test that a handler on two event types sees a batch in publish order"""
+    received = []
+    event_bus.subscribe("RATING_ADDED", received.append)
+    event_bus.subscribe("LOAN_ISSUED", received.append)
+
+    event_bus.publish_batch([
+        ("RATING_ADDED", {"book_id": "1"}),
+        ("LOAN_ISSUED", {"book_id": "2"}),
+        ("RATING_ADDED", {"book_id": "3"}),
+    ])
+
+    assert [e.payload["book_id"] for e in received] == ["1", "2", "3"]
+
+
+def test_publish_batch_recent_loans_newest_first(event_handlers, monkeypatch):
+    """Test that batched loans get their own timestamps, so the newest is listed first"""
+    import itertools
+    clock = itertools.count(1000)
+    monkeypatch.setattr("core.events.time.time", lambda: next(clock))
+
+    bus = EventBus()
+    bus.subscribe("LOAN_ISSUED", event_handlers.update_recent_loans)
+    bus.publish_batch([("LOAN_ISSUED", {"user_id": "u1", "book_id": str(i)}) for i in range(3)])
+
+    assert [loan["book_id"] for loan in event_handlers.state["recent_loans"]] == ["2", "1", "0"]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_async_yields_queued_events_in_batches(event_bus):
+    """Test that an async subscriber receives already-queued events as one batch"""
+    stream = event_bus.subscribe_async("RATING_ADDED")
+
+    for book_id in ("1", "2", "3"):
+        event_bus.publish("RATING_ADDED", {"book_id": book_id})
+    event_bus.publish("LOAN_ISSUED", {"book_id": "4"})
+
+    batch = await stream.__anext__()
+    assert [e.payload["book_id"] for e in batch] == ["1", "2", "3"]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_subscription_close_and_cleanup(event_bus):
+    """Test that closed or dropped async subscriptions stop receiving events"""
+    import gc
+
+    async with event_bus.subscribe_async("RATING_ADDED") as stream:
+        event_bus.publish("RATING_ADDED", {"book_id": "1"})
+        assert [e.payload["book_id"] for e in await stream.__anext__()] == ["1"]
+    assert stream.closed
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+    # Never iterated and dropped without close(): unregistered on collection
+    abandoned = event_bus.subscribe_async("RATING_ADDED")
+    assert len(event_bus._queues["RATING_ADDED"]) == 1
+    del abandoned
+    gc.collect()
+    assert event_bus._queues["RATING_ADDED"] == []
+
+
+@pytest.mark.asyncio
+async def test_async_subscription_close_wakes_waiting_consumer(event_bus):
+    """Test that closing a subscription ends an async for that is waiting for events"""
+    import asyncio
+
+    stream = event_bus.subscribe_async("RATING_ADDED")
+    batches = []
+
+    async def consume():
+        async for batch in stream:
+            batches.append(batch)
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0)
+    await stream.aclose()
+
+    await asyncio.wait_for(consumer, timeout=1)
+    assert batches == []
+
+
+@pytest.mark.asyncio
+async def test_async_subscription_drops_oldest_when_full(event_bus):
+    """Test that an async subscription keeps only the newest max_pending events"""
+    stream = event_bus.subscribe_async("RATING_ADDED", max_pending=2)
+    for book_id in ("1", "2", "3"):
+        event_bus.publish("RATING_ADDED", {"book_id": book_id})
+
+    batch = await stream.__anext__()
+    assert [e.payload["book_id"] for e in batch] == ["2", "3"]
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_matching_event(event_bus):
+    """Test that wait_for resolves on the first event passing check and times out otherwise"""
+    import asyncio
+
+    waiter = asyncio.ensure_future(
+        event_bus.wait_for("RATING_ADDED", lambda e: e.payload["book_id"] == "2", timeout=1)
+    )
+    await asyncio.sleep(0)
+    event_bus.publish("RATING_ADDED", {"book_id": "1"})
+    event_bus.publish("RATING_ADDED", {"book_id": "2"})
+
+    event = await waiter
+    assert event.payload["book_id"] == "2"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await event_bus.wait_for("RATING_ADDED", timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_check_error_stays_with_waiter(event_bus):
+    """Test that a raising wait_for check fails that waiter but not the publisher"""
+    import asyncio
+
+    received = []
+    event_bus.subscribe("RATING_ADDED", received.append)
+
+    def bad_check(event):
+        raise KeyError("missing")
+
+    waiter = asyncio.ensure_future(event_bus.wait_for("RATING_ADDED", bad_check, timeout=1))
+    await asyncio.sleep(0)
+    event_bus.publish("RATING_ADDED", {"book_id": "1"})
+
+    assert [e.payload["book_id"] for e in received] == ["1"]
+    with pytest.raises(KeyError):
+        await waiter
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -1,8 +1,3 @@
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from core.compose import compose, pipe
 from core.services import LibraryService, RecoService, DayReport
 from core.domain import Book, User, Rating
@@ -79,15 +74,6 @@ def test_day_report_structure():
     print("✅ test_day_report_structure passed")
 
 
-if __name__ == "__main__":
-    test_compose_basic()
-    test_pipe_basic()
-    test_library_service_initialization()
-    test_reco_service_initialization()
-    test_day_report_structure()
-    print("🎉All 5 tests passed! ")
-
-
 # ==================== Lab 8扩展测试：服务管道性能 ====================
 
 def test_service_pipeline_performance():
@@ -137,4 +123,4 @@ def test_reco_service_with_filters():
     # 验证过滤器工作正常
     assert len(recommendations) <= 2  # 只有2个推荐分数>0.75
     if recommendations:
-        assert all(rec.score > 0.75 for rec in recommendations)
\ No newline at end of file
+        assert all(rec.score > 0.75 for rec in recommendations)
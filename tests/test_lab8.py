@@ -1,10 +1,6 @@
 import pytest
 import asyncio
 import time
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.async_utils import AsyncRecoEngine, benchmark_recommendations
 from core.services import AsyncRecoService, Recommendation
@@ -241,8 +237,3 @@ async def test_large_number_of_users(sample_data):
     assert users_with_recommendations >= 10  # 至少10个用户有推荐
 
     engine.shutdown()
-
-
-if __name__ == "__main__":
-    # 运行测试
-    pytest.main([__file__, "-v", "-s"])
\ No newline at end of file